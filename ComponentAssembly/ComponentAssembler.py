@@ -12,10 +12,12 @@ from GraphController.SubtreeMover.SubtreeMover import SubtreeMover
 from GraphModel.Graph import Graph
 from GraphModel.RandomGraphGenerator import RandomGraphGenerator
 from GraphModel.SelectedNodeContainer import SelectedNodeContainer
+from GraphModel.SpatialIndex import SpatialIndex
 from ComponentAssembly.IComponentProvider import IComponentProvider
 from View.GraphView import IScaleOffsetTransformer, IGraphVisualizer
 from View.GraphView.GraphVisualizer import GraphVisualizer
 from View.GraphView.ScaleOffsetTransformer import ScaleOffsetTransformer
+from View.RedrawTracker import RedrawTracker
 from GraphController.ScreenDragHandler.ScreenDragHandler import ScreenDragHandler, IDragHandler
 from View.UI.NodeDetailsWindow import INodeDetailsWindow
 from View.UI.NodeDetailsWindow.NodeDetailsWindow import NodeDetailsWindow
@@ -34,15 +36,10 @@ class ComponentAssembler(IComponentProvider):
     way to access and modify different parts of the application.
     """
 
-    # Initialisierung von pygame
-    pygame.init()
-
-    # WIDTH, HEIGHT = 1000, 800
-    WIDTH, HEIGHT = pygame.display.Info().current_w, pygame.display.Info().current_h
-    window_width, window_height = WIDTH - 10, HEIGHT - 50
-    # screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
-    screen = pygame.display.set_mode((window_width, window_height))
-    pygame.display.set_caption("EPI Knowledge Graph")
+    # Display, opened by initialize_display when the first ComponentAssembler is created
+    WIDTH, HEIGHT = 0, 0
+    window_width, window_height = 0, 0
+    screen = None
 
     # Colors
     uiTheme = BKTheme()
@@ -59,6 +56,8 @@ class ComponentAssembler(IComponentProvider):
         """
         self.debug_mode = debug_mode
 
+        self.initialize_display()
+
         # Graph
         self.graph = graph
 
@@ -69,6 +68,9 @@ class ComponentAssembler(IComponentProvider):
         # Container for currently selected Node
         self.selected_node_container = SelectedNodeContainer()
 
+        # Collects repaint requests of the components
+        self.redraw_tracker = RedrawTracker()
+
         if debug_mode:
             self.graph.nodes.clear()
             # Node Generator for Testing
@@ -84,14 +86,18 @@ class ComponentAssembler(IComponentProvider):
         self.graph_layout_handler: IGraphLayoutHandler
         self.graph_layout_handler = AutoLayoutHandler(0, 0, 50000000,
                                                       self.scale_offset_transformer, self.screen,
-                                                      self.uiTheme.BARNES_HUT_COLOR, self.graph)
+                                                      self.uiTheme.BARNES_HUT_COLOR, self.graph,
+                                                      run_in_background=True)
 
         # Drag Screen
         self.drag_handler: IDragHandler
         self.drag_handler = ScreenDragHandler(self.scale_offset_transformer)
 
         # Drag Graph
-        self.subtree_mover = SubtreeMover()
+        self.subtree_mover = SubtreeMover(self.graph)
+
+        # Spatial index of the node positions, shared by visualization and hit-testing
+        self.spatial_index = SpatialIndex(self.graph)
 
         # Graph Visualization
         self.graph_visualizer: IGraphVisualizer
@@ -99,7 +105,9 @@ class ComponentAssembler(IComponentProvider):
                                                 self.screen, self.graph, self.selected_node_container,
                                                 self.uiTheme.EDGE_COLOR, self.uiTheme.NODE_COLOR,
                                                 self.uiTheme.SELECTED_NODE_COLOR,
-                                                self.uiTheme.SELECTED_NODE_SUBTREE_COLOR)
+                                                self.uiTheme.SELECTED_NODE_SUBTREE_COLOR,
+                                                self.spatial_index, self.uiTheme.BACKGROUND_COLOR,
+                                                self.redraw_tracker)
         # Resources
         current_directory = os.path.dirname(os.path.abspath(__file__))
         self.resources_folder_path = os.path.join(current_directory, '../Resources')
@@ -108,17 +116,38 @@ class ComponentAssembler(IComponentProvider):
         self.node_details_window: INodeDetailsWindow
         self.node_details_window = NodeDetailsWindow(self.window_width, self.window_height, self.screen, self.uiTheme,
                                                      self.selected_node_container,
-                                                     self.resources_folder_path)
+                                                     self.resources_folder_path, self.redraw_tracker)
 
         # Find Node at Position
-        self.node_finder = NodeFinder(self.graph, self.scale_offset_transformer)
+        self.node_finder = NodeFinder(self.graph, self.scale_offset_transformer, self.spatial_index)
 
         # Initialisiere das Menü
         self.graph_exporter = GraphExporter(self.graph, self.resources_folder_path)
         self.graph_importer = GraphImporter(self.graph, self.resources_folder_path, graph_analyzer)
         self.main_menu = MainMenu(self.window_width, self.window_height, 0, 0, 10, self.uiTheme,
                                   self.resources_folder_path, self.graph_exporter,
-                                  self.graph_importer)
+                                  self.graph_importer, self.redraw_tracker)
+
+    @classmethod
+    def initialize_display(cls):
+        """
+        Initializes pygame and opens the window on the first call. Importing this module therefore does not start
+        SDL, which is only done when the application is actually assembled.
+
+        :return: The screen surface.
+        """
+        if cls.screen is None:
+            # Initialisierung von pygame
+            pygame.init()
+
+            # WIDTH, HEIGHT = 1000, 800
+            display_info = pygame.display.Info()
+            cls.WIDTH, cls.HEIGHT = display_info.current_w, display_info.current_h
+            cls.window_width, cls.window_height = cls.WIDTH - 10, cls.HEIGHT - 50
+            # screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
+            cls.screen = pygame.display.set_mode((cls.window_width, cls.window_height))
+            pygame.display.set_caption("EPI Knowledge Graph")
+        return cls.screen
 
     def get_screen(self):
         return self.screen
@@ -152,3 +181,6 @@ class ComponentAssembler(IComponentProvider):
 
     def get_graph_visualizer(self):
         return self.graph_visualizer
+
+    def get_redraw_tracker(self):
+        return self.redraw_tracker
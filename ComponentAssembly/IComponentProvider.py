@@ -94,4 +94,12 @@ class IComponentProvider(ABC):
         Abstract method to provide the GraphVisualizer Component.
         This component is responsible for the visual representation of the graph, including rendering nodes and edges.
         Implementations should return an instance of GraphVisualizer.
-        """
\ No newline at end of file
+        """
+
+    @abstractmethod
+    def get_redraw_tracker(self):
+        """
+        Abstract method to provide the RedrawTracker.
+        Components mark the screen as dirty through it and the application loop only draws frames when needed.
+        Implementations should return an instance of RedrawTracker.
+        """
@@ -1,6 +1,4 @@
 import json
-import tkinter as tk
-from tkinter import filedialog
 from GraphModel import Graph
 import os
 import zipfile
@@ -33,21 +31,9 @@ class GraphExporter:
         the JSON data and associated images. The function handles the creation of the JSON data structure, the
         saving of the file, and the management of the ZIP archive.
         """
-        # Prepare graph data for export
-        graph_data = {
-            "team_name": self.graph.team_name,  # Adding the team name
-            "nodes": [
-                {
-                    "uuid": str(node.uuid),
-                    "description": node.description,
-                    "titel": node.titel,
-                    "x": node.x,
-                    "y": node.y,
-                    "image_name": node.image_name,
-                    "connected_nodes": [str(uuid) for uuid in node.get_connected_nodes()]
-                } for node in self.graph.nodes
-            ]
-        }
+        # tkinter is only needed for the dialog, so importing the exporter in headless tools does not load it
+        import tkinter as tk
+        from tkinter import filedialog
 
         # Initialize file dialog for saving the file
         root = tk.Tk()
@@ -58,20 +44,50 @@ class GraphExporter:
         # file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
         # if file_path:
         #     with open(file_path, 'w') as file:
-        #         json.dump(graph_data, file)
+        #         json.dump(self.create_graph_data(), file)
 
         # Export to ZIP
         file_path = filedialog.asksaveasfilename(defaultextension=".zip", filetypes=[("ZIP files", "*.zip")])
         if file_path:
-            with zipfile.ZipFile(file_path, 'w') as zipf:
-                # Add JSON file to ZIP
-                json_path = file_path.replace('.zip', '.json')
-                with open(json_path, 'w') as file:
-                    json.dump(graph_data, file)
-                zipf.write(json_path, os.path.basename(json_path))
-                os.remove(json_path)  # Delete temporary JSON file
+            self.export_graph_to_zip(file_path)
 
-                # Add images to ZIP
-                for image in os.listdir(self.image_folder_path):
-                    zipf.write(os.path.join(self.image_folder_path, image), image)
+    def create_graph_data(self):
+        """
+        Creates the JSON data structure of the graph, including the team name, all nodes and their connections.
+
+        :return: A dictionary containing the graph data.
+        """
+        return {
+            "team_name": self.graph.team_name,  # Adding the team name
+            "nodes": [
+                {
+                    "uuid": str(node.uuid),
+                    "description": node.description,
+                    "titel": node.titel,
+                    "x": node.x,
+                    "y": node.y,
+                    "image_name": node.image_name,
+                    "connected_nodes": [str(uuid) for uuid in node.get_connected_nodes()]
+                } for node in self.graph.nodes
+            ]
+        }
+
+    def export_graph_to_zip(self, file_path):
+        """
+        Exports the graph data and all images of the resources folder into a ZIP file at the given path,
+        without opening a file dialog.
+
+        :param: file_path: The path of the ZIP file to be written.
+        """
+        graph_data = self.create_graph_data()
+        with zipfile.ZipFile(file_path, 'w') as zipf:
+            # Add JSON file to ZIP
+            json_path = file_path.replace('.zip', '.json')
+            with open(json_path, 'w') as file:
+                json.dump(graph_data, file)
+            zipf.write(json_path, os.path.basename(json_path))
+            os.remove(json_path)  # Delete temporary JSON file
 
+            # Add images to ZIP
+            for image in os.listdir(self.image_folder_path):
+                zipf.write(os.path.join(self.image_folder_path, image), image)
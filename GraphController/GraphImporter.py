@@ -1,8 +1,8 @@
-import json
-import tkinter as tk
-from tkinter import filedialog
+import io
+import shutil
 
 from ComponentAssembly.GraphAnalyzer import GraphAnalyzer
+from GraphController.StreamingJsonReader import StreamingJsonReader
 from GraphModel.Graph import Graph
 from GraphModel.Node import Node
 import os
@@ -16,7 +16,13 @@ class GraphImporter:
     contain related image files. The class handles the extraction and processing of this data, converting it
     into a usable graph structure within the application. It integrates closely with GraphAnalyzer for post-import
     analysis and verification of the graph structure.
+
+    The JSON data is parsed directly from the ZIP file as a stream, node by node, and the images are copied in
+    chunks, so importing large files neither loads them into memory as a whole nor writes temporary files.
     """
+    # Amount of bytes copied at once when extracting an image
+    IMAGE_COPY_CHUNK_SIZE = 1 << 20
+
     def __init__(self, graph: Graph, resources_folder_path, graph_analyzer: GraphAnalyzer):
         """
         Initializes the GraphImporter with a specific graph, a path to the resources folder, and a graph analyzer.
@@ -37,26 +43,38 @@ class GraphImporter:
         It then extracts and processes the contents of the file, including images and JSON data, to reconstruct the graph.
         Post-import, it also uses GraphAnalyzer to provide statistics about the newly imported graph.
         """
+        # tkinter is only needed for the dialog, so importing the importer in headless tools does not load it
+        import tkinter as tk
+        from tkinter import filedialog
+
         self.graph.nodes.clear()
         root = tk.Tk()
         root.withdraw()
         zip_file_path = filedialog.askopenfilename(filetypes=[("ZIP files", "*.zip")])
         if zip_file_path:
-            with zipfile.ZipFile(zip_file_path, 'r') as zipf:
-                # Bilder zuerst extrahieren und dabei Namen prüfen und speichern
-                image_name_mapping = self.extract_and_rename_images(zipf)
+            self.import_graph_from_zip(zip_file_path)
 
-                # Namen der JSON-Datei aus dem ZIP-Dateinamen ableiten
-                json_file_name = os.path.basename(zip_file_path).replace('.zip', '.json')
+    def import_graph_from_zip(self, zip_file_path):
+        """
+        Imports graph data from the ZIP file at the given path, without opening a file dialog.
 
-                if json_file_name in zipf.namelist():
-                    zipf.extract(json_file_name)
-                    with open(json_file_name, 'r') as file:
-                        graph_data = json.load(file)
-                    os.remove(json_file_name)  # Temporäre JSON-Datei löschen
+        :param: zip_file_path: The path of the ZIP file to be imported.
+        :return: The imported graph, or None if the ZIP file does not contain the graph data.
+        """
+        self.graph.nodes.clear()
+        with zipfile.ZipFile(zip_file_path, 'r') as zipf:
+            # Bilder zuerst extrahieren und dabei Namen prüfen und speichern
+            image_name_mapping = self.extract_and_rename_images(zipf)
 
-                    # Graph aus der JSON-Datei erstellen
-                    self.create_graph_from_json(graph_data, image_name_mapping)
+            # Namen der JSON-Datei aus dem ZIP-Dateinamen ableiten
+            json_file_name = os.path.basename(zip_file_path).replace('.zip', '.json')
+
+            if json_file_name in zipf.namelist():
+                # Graph direkt aus der JSON-Datei im ZIP erstellen, ohne sie zu entpacken
+                with zipf.open(json_file_name) as binary_file, io.TextIOWrapper(binary_file, encoding='utf-8') as file:
+                    self.create_graph_from_stream(StreamingJsonReader(file), image_name_mapping)
+                return self.graph
+        return None
 
     def extract_and_rename_images(self, zipf):
         """
@@ -76,8 +94,8 @@ class GraphImporter:
                 if os.path.exists(original_image_path):
                     final_image_name = self.graph.team_name + "_" + file
                 final_image_path = os.path.join(self.image_folder_path, final_image_name)
-                with open(final_image_path, 'wb') as f_out:
-                    f_out.write(zipf.read(file))
+                with zipf.open(file) as f_in, open(final_image_path, 'wb') as f_out:
+                    shutil.copyfileobj(f_in, f_out, self.IMAGE_COPY_CHUNK_SIZE)
                 if original_image_name != final_image_name:
                     image_name_mapping[original_image_name] = final_image_name
         return image_name_mapping
@@ -94,26 +112,59 @@ class GraphImporter:
         graph = Graph()
         graph.team_name = graph_data.get("team_name", "Standardteamname")
         nodes = {}
+        connections = []
         for node_data in graph_data["nodes"]:
-            image_name = node_data["image_name"]
-            # Update image_name if it's in the mapping
-            if image_name in image_name_mapping:
-                image_name = image_name_mapping[image_name]
-
-            node = Node(
-                node_data["description"],
-                node_data["titel"],
-                image_name,
-                node_data["x"],
-                node_data["y"],
-            )
-            node.uuid = node_data["uuid"]
-            nodes[node.uuid] = node
-            graph.nodes.append(node)
+            self.__add_node(graph, nodes, connections, node_data, image_name_mapping)
+        self.__finish_graph(graph, nodes, connections)
 
-        for node_data in graph_data["nodes"]:
-            for connected_uuid in node_data["connected_nodes"]:
-                nodes[node_data["uuid"]].connect(nodes[connected_uuid])
+    def create_graph_from_stream(self, reader: StreamingJsonReader, image_name_mapping):
+        """
+        Creates a graph from JSON data that is read as a stream. Every node is created as soon as its data has been
+        read, its connections are made after all nodes have been created.
+
+        :param: reader: A StreamingJsonReader positioned at the start of the graph data.
+        :param: image_name_mapping: A dictionary mapping original image names to new names.
+        """
+        graph = Graph()
+        nodes = {}
+        connections = []
+        graph_data = reader.read_object({
+            "nodes": lambda node_data: self.__add_node(graph, nodes, connections, node_data, image_name_mapping)
+        })
+        graph.team_name = graph_data.get("team_name", "Standardteamname")
+        self.__finish_graph(graph, nodes, connections)
+
+    @staticmethod
+    def __add_node(graph, nodes, connections, node_data, image_name_mapping):
+        """
+        Creates a node from its data and adds it to the graph. Its connections are appended to 'connections' as a
+        tuple of the node and the UUIDs of the connected nodes, since these might not have been created yet.
+        """
+        image_name = node_data["image_name"]
+        # Update image_name if it's in the mapping
+        if image_name in image_name_mapping:
+            image_name = image_name_mapping[image_name]
+
+        node = Node(
+            node_data["description"],
+            node_data["titel"],
+            image_name,
+            node_data["x"],
+            node_data["y"],
+        )
+        node.uuid = node_data["uuid"]
+        nodes[node.uuid] = node
+        graph.nodes.append(node)
+        connections.append((node, node_data["connected_nodes"]))
+
+    def __finish_graph(self, graph, nodes, connections):
+        """
+        Connects the created nodes, makes the graph the imported one and displays its statistics.
+        """
+        for node, connected_uuids in connections:
+            for connected_uuid in connected_uuids:
+                node.connect(nodes[connected_uuid])
 
         self.graph = graph
+        self.graph.notify_positions_changed()
         self.graph_analyzer.display_statistics(graph)
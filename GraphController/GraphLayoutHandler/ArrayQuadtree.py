@@ -0,0 +1,446 @@
+import numpy as np
+
+
+class ArrayQuadtree:
+    """
+    The ArrayQuadtree is a flat, array backed quadtree for the Barnes-Hut algorithm. Instead of one object per
+    quadrant, all cells are stored in parallel NumPy arrays (bounds, child indices, total mass and center of mass).
+
+    The tree is built without recursion from the Morton-sorted positions of the nodes: every cell covers a
+    contiguous range of the sorted nodes, so splitting a cell only needs a binary search for the boundaries of its
+    four children, and mass and center of mass of a cell follow from prefix sums. Cells containing at most
+    leaf_capacity nodes are not subdivided any further. The arrays are kept between builds and only grow if a
+    larger tree is required, so rebuilding the tree every frame does not allocate objects per node.
+
+    Like the BarnesHutNode it replaces, a cell is described by its lower left corner (x, y) and its edge length
+    (size). Children are numbered by quadrant: +1 for the right half, +2 for the upper half.
+
+    If no root area is given, neither to the build nor as a fixed root area of the tree, the root cell is fitted to
+    the bounding box of the nodes on every build, so no levels are wasted on subdividing empty space.
+    """
+    # Maximum amount of nodes in a cell before it is subdivided
+    LEAF_CAPACITY = 8
+    # Maximum depth of the tree. The Morton codes use one bit per level and axis, so at most 31 levels fit.
+    MAX_DEPTH = 26
+    # Maximum depth for root areas fitted to the nodes, which are much smaller than a fixed simulation area
+    ADAPTIVE_MAX_DEPTH = 16
+    # Margin added on each side of the bounding box of the nodes when the root area is fitted to them
+    BOUNDS_PADDING = 0.05
+    # Smallest edge length of a fitted root area, e.g. if all nodes share the same position
+    MIN_ROOT_SIZE = 1.0
+    # Amount of nodes whose forces are traversed together in calculate_forces
+    TRAVERSAL_CHUNK_SIZE = 2048
+    # Nodes closer than this distance are treated as one point, as in the object based BarnesHutNode
+    MIN_DISTANCE = 1e-10
+    # Arrays needed to traverse the tree, e.g. to share it with other processes
+    NODE_ARRAYS = ('x', 'y', 'masses', 'node_order')
+    CELL_ARRAYS = ('cell_x', 'cell_y', 'cell_size', 'total_mass', 'center_of_mass_x', 'center_of_mass_y',
+                   'children', 'node_start', 'node_end')
+
+    def __init__(self, leaf_capacity=LEAF_CAPACITY, max_depth=MAX_DEPTH, root_area=None):
+        """
+        Initializes an empty ArrayQuadtree.
+
+        :param: leaf_capacity: Maximum amount of nodes in a cell before it is subdivided.
+        :param: max_depth: Maximum depth of the tree, cells on this level are never subdivided.
+        :param: root_area: Tuple (x_location, y_location, size) of the root cell used by builds without an area,
+        or None to fit the root cell to the nodes.
+        """
+        self.leaf_capacity = max(1, leaf_capacity)
+        self.max_depth = min(max_depth, 31)
+        self.root_area = root_area
+
+        self.cell_count = 0
+        self.depth = 0
+        self.x_location = 0.0
+        self.y_location = 0.0
+        self.size = 0.0
+
+        # Node data in Morton order
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.masses = np.zeros(0)
+        self.node_order = np.zeros(0, dtype=np.intp)
+
+        # Cell data, valid up to cell_count
+        self.__capacity = 0
+        self.cell_x = np.zeros(0)
+        self.cell_y = np.zeros(0)
+        self.cell_size = np.zeros(0)
+        self.total_mass = np.zeros(0)
+        self.center_of_mass_x = np.zeros(0)
+        self.center_of_mass_y = np.zeros(0)
+        self.children = np.zeros((0, 4), dtype=np.intp)
+        self.node_start = np.zeros(0, dtype=np.intp)
+        self.node_end = np.zeros(0, dtype=np.intp)
+
+    @classmethod
+    def for_area(cls, x_location, y_location, size, adaptive_bounds):
+        """
+        Creates the tree of a Barnes-Hut manager, which either uses a fixed simulation area or fits the root cell to
+        the nodes on every build.
+
+        :param: x_location: x-coordinate of the lower left corner of the fixed area.
+        :param: y_location: y-coordinate of the lower left corner of the fixed area.
+        :param: size: Edge length of the fixed area.
+        :param: adaptive_bounds: If True, the fixed area is ignored and the root cell is fitted to the nodes.
+        :return: A new ArrayQuadtree.
+        """
+        if adaptive_bounds:
+            return cls(max_depth=cls.ADAPTIVE_MAX_DEPTH)
+        return cls(max_depth=cls.MAX_DEPTH, root_area=(x_location, y_location, size))
+
+    def build(self, x, y, masses, x_location=None, y_location=None, size=None):
+        """
+        Builds the tree for the given nodes inside the square area starting at (x_location, y_location).
+        Nodes outside of the area are clamped to its border. If no area is given, the root_area of the tree is used,
+        or if there is none, the area is fitted to the nodes.
+
+        :param: x: Array with the x-coordinates of the nodes.
+        :param: y: Array with the y-coordinates of the nodes.
+        :param: masses: Array with the masses of the nodes.
+        :param: x_location: x-coordinate of the lower left corner of the root cell.
+        :param: y_location: y-coordinate of the lower left corner of the root cell.
+        :param: size: Edge length of the root cell.
+        """
+        if size is None:
+            if self.root_area is not None:
+                x_location, y_location, size = self.root_area
+            else:
+                x_location, y_location, size = self.calculate_root_bounds(x, y)
+        self.x_location, self.y_location, self.size = float(x_location), float(y_location), float(size)
+        self.cell_count = 0
+        self.depth = 0
+        node_count = len(x)
+        if node_count == 0:
+            self.x, self.y, self.masses = np.zeros(0), np.zeros(0), np.zeros(0)
+            self.node_order = np.zeros(0, dtype=np.intp)
+            return
+
+        # Sort the nodes along the Morton curve
+        resolution = 1 << self.max_depth
+        grid_x = np.clip((np.asarray(x) - self.x_location) * (resolution / self.size), 0, resolution - 1)
+        grid_y = np.clip((np.asarray(y) - self.y_location) * (resolution / self.size), 0, resolution - 1)
+        codes = self.__interleave_bits(grid_x.astype(np.uint64)) | (self.__interleave_bits(grid_y.astype(np.uint64))
+                                                                     << np.uint64(1))
+        self.node_order = np.argsort(codes, kind='stable')
+        codes = codes[self.node_order]
+        self.x = np.asarray(x, dtype=float)[self.node_order]
+        self.y = np.asarray(y, dtype=float)[self.node_order]
+        self.masses = np.asarray(masses, dtype=float)[self.node_order]
+
+        # Prefix sums relative to the root corner for mass and center of mass of arbitrary node ranges
+        cumulative_mass = np.concatenate(([0.0], np.cumsum(self.masses)))
+        cumulative_mass_x = np.concatenate(([0.0], np.cumsum(self.masses * (self.x - self.x_location))))
+        cumulative_mass_y = np.concatenate(([0.0], np.cumsum(self.masses * (self.y - self.y_location))))
+
+        # Root cell
+        self.__ensure_capacity(1)
+        level_cells = np.zeros(1, dtype=np.intp)
+        level_start = np.zeros(1, dtype=np.intp)
+        level_end = np.full(1, node_count, dtype=np.intp)
+        level_prefix = np.zeros(1, dtype=np.uint64)
+        level_grid_x = np.zeros(1, dtype=np.int64)
+        level_grid_y = np.zeros(1, dtype=np.int64)
+        self.cell_count = 1
+        depth = 0
+
+        while True:
+            self.__fill_cells(level_cells, level_start, level_end, level_grid_x, level_grid_y, depth,
+                              cumulative_mass, cumulative_mass_x, cumulative_mass_y)
+            self.depth = depth
+            if depth >= self.max_depth:
+                break
+            split = (level_end - level_start) > self.leaf_capacity
+            if not split.any():
+                break
+
+            # Binary search the boundaries of the four children of every cell that is split
+            parents = level_cells[split]
+            child_prefix = level_prefix[split, np.newaxis] * np.uint64(4) + np.arange(5, dtype=np.uint64)
+            shift = np.uint64(2 * (self.max_depth - depth - 1))
+            boundaries = np.searchsorted(codes, child_prefix << shift)
+            child_start = boundaries[:, :4].ravel()
+            child_end = boundaries[:, 1:].ravel()
+            not_empty = child_end > child_start
+
+            quadrants = np.tile(np.arange(4), len(parents))[not_empty]
+            child_parents = np.repeat(parents, 4)[not_empty]
+            child_count = int(not_empty.sum())
+            child_cells = np.arange(self.cell_count, self.cell_count + child_count)
+            self.__ensure_capacity(self.cell_count + child_count)
+            self.children[child_parents, quadrants] = child_cells
+            self.cell_count += child_count
+
+            level_cells = child_cells
+            level_start = child_start[not_empty]
+            level_end = child_end[not_empty]
+            level_prefix = child_prefix[:, :4].ravel()[not_empty]
+            level_grid_x = np.repeat(level_grid_x[split], 4)[not_empty] * 2 + (quadrants & 1)
+            level_grid_y = np.repeat(level_grid_y[split], 4)[not_empty] * 2 + (quadrants >> 1)
+            depth += 1
+
+    def calculate_root_bounds(self, x, y):
+        """
+        Calculates the smallest square area containing all nodes, extended by BOUNDS_PADDING on each side.
+
+        :param: x: Array with the x-coordinates of the nodes.
+        :param: y: Array with the y-coordinates of the nodes.
+        :return: The lower left corner and the edge length (x_location, y_location, size) of the area.
+        """
+        if len(x) == 0:
+            return 0.0, 0.0, self.MIN_ROOT_SIZE
+        min_x, max_x = float(np.min(x)), float(np.max(x))
+        min_y, max_y = float(np.min(y)), float(np.max(y))
+        size = max(max_x - min_x, max_y - min_y, self.MIN_ROOT_SIZE) * (1 + 2 * self.BOUNDS_PADDING)
+        # Center the square on the bounding box
+        return (min_x + max_x - size) / 2, (min_y + max_y - size) / 2, size
+
+    def get_statistics(self):
+        """
+        Returns the depth and the amount of cells of the last build, to judge how well the tree fits the nodes.
+
+        :return: Tuple (depth, cell_count).
+        """
+        return self.depth, self.cell_count
+
+    def copy_cells(self):
+        """
+        Returns a copy of the cells of the last build, which stays valid while the tree is built again.
+
+        :return: Tuple (depth, cell_count, cell_x, cell_y, cell_size) with arrays of the lower left corners (the
+        smallest x- and y-coordinates) and the edge lengths of the cells.
+        """
+        cell_count = self.cell_count
+        return (self.depth, cell_count, self.cell_x[:cell_count].copy(), self.cell_y[:cell_count].copy(),
+                self.cell_size[:cell_count].copy())
+
+    def calculate_force(self, x, y, mass, force_modification=1.0, theta=3.0):
+        """
+        Calculate the repulsion force acting on a single particle at (x, y). The tree is traversed iteratively
+        with an explicit stack.
+
+        :param: x: The x-coordinate of the particle.
+        :param: y: The y-coordinate of the particle.
+        :param: mass: The mass of the particle.
+        :param: force_modification: A scaling factor for the force calculation.
+        :param: theta: The threshold parameter for deciding whether to approximate distant clusters.
+        :return: The force components (fx, fy) acting on the particle.
+        """
+        total_fx, total_fy = 0.0, 0.0
+        if self.cell_count == 0:
+            return total_fx, total_fy
+
+        stack = [0]
+        while stack:
+            cell = stack.pop()
+            dx = self.center_of_mass_x[cell] - x
+            dy = self.center_of_mass_y[cell] - y
+            distance = max(np.hypot(dx, dy), self.MIN_DISTANCE)
+
+            if self.cell_size[cell] / distance < theta:
+                # The cell is sufficiently far away, treat it as a single particle
+                force = -((mass * self.total_mass[cell] / (distance ** 1.2)) * force_modification)
+                total_fx += force * dx / distance
+                total_fy += force * dy / distance
+            elif (self.children[cell] >= 0).any():
+                stack.extend(child for child in self.children[cell] if child >= 0)
+            else:
+                # Leaf cell: calculate the force of each contained particle directly
+                node_range = slice(self.node_start[cell], self.node_end[cell])
+                fx, fy = self.__direct_forces(self.x[node_range] - x, self.y[node_range] - y,
+                                              mass * self.masses[node_range], force_modification)
+                total_fx += fx.sum()
+                total_fy += fy.sum()
+        return total_fx, total_fy
+
+    def calculate_forces(self, force_modification=1.0, theta=3.0, node_indices=None):
+        """
+        Calculate the repulsion force acting on the nodes the tree was built from. All nodes are traversed
+        together: the tree is descended level by level on an array of (node, cell) pairs, pairs whose cell
+        is far enough away are approximated and the others are replaced by the children of the cell.
+
+        :param: force_modification: A scaling factor for the force calculation.
+        :param: theta: The threshold parameter for deciding whether to approximate distant clusters.
+        :param: node_indices: Optional indices (in the order the nodes were passed to build) of the nodes whose
+        forces are calculated. Defaults to all nodes.
+        :return: Array of shape (n, 2) with the force acting on each requested node.
+        """
+        if node_indices is None:
+            node_indices = np.arange(len(self.x))
+        node_indices = np.asarray(node_indices, dtype=np.intp)
+        forces = np.zeros((len(node_indices), 2))
+        if self.cell_count == 0 or len(node_indices) == 0:
+            return forces
+
+        # Position of each requested node in Morton order
+        sorted_position = np.empty_like(self.node_order)
+        sorted_position[self.node_order] = np.arange(len(self.node_order))
+        sorted_indices = sorted_position[node_indices]
+
+        for start in range(0, len(node_indices), self.TRAVERSAL_CHUNK_SIZE):
+            chunk = sorted_indices[start:start + self.TRAVERSAL_CHUNK_SIZE]
+            forces[start:start + len(chunk)] = self.__traverse(chunk, force_modification, theta)
+        return forces
+
+    def calculate_sorted_forces(self, start, end, force_modification=1.0, theta=3.0):
+        """
+        Calculate the repulsion force acting on a contiguous range of nodes in Morton order. Neighbouring nodes in
+        Morton order are close to each other, so such ranges are well suited to split the work between workers.
+
+        :param: start: First index of the range in Morton order.
+        :param: end: End (exclusive) of the range in Morton order.
+        :param: force_modification: A scaling factor for the force calculation.
+        :param: theta: The threshold parameter for deciding whether to approximate distant clusters.
+        :return: Array of shape (end - start, 2) with the force acting on each node of the range.
+        """
+        forces = np.zeros((max(end - start, 0), 2))
+        if self.cell_count == 0:
+            return forces
+        for chunk_start in range(start, end, self.TRAVERSAL_CHUNK_SIZE):
+            chunk = np.arange(chunk_start, min(chunk_start + self.TRAVERSAL_CHUNK_SIZE, end))
+            forces[chunk_start - start:chunk_start - start + len(chunk)] = self.__traverse(chunk, force_modification,
+                                                                                         theta)
+        return forces
+
+    def get_arrays(self):
+        """
+        Returns the arrays describing the current tree, trimmed to the used cells.
+
+        :return: Dictionary mapping the names in NODE_ARRAYS and CELL_ARRAYS to arrays.
+        """
+        arrays = {name: getattr(self, name) for name in self.NODE_ARRAYS}
+        arrays.update({name: getattr(self, name)[:self.cell_count] for name in self.CELL_ARRAYS})
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        Creates a tree from arrays returned by get_arrays. The arrays are used without copying them, e.g. to
+        traverse a tree placed in shared memory by another process.
+
+        :param: arrays: Dictionary mapping the names in NODE_ARRAYS and CELL_ARRAYS to arrays.
+        :return: A new ArrayQuadtree.
+        """
+        quadtree = cls()
+        for name in cls.NODE_ARRAYS + cls.CELL_ARRAYS:
+            setattr(quadtree, name, arrays[name])
+        quadtree.cell_count = len(quadtree.cell_x)
+        return quadtree
+
+    def __traverse(self, nodes, force_modification, theta):
+        """
+        Traverses the tree for a chunk of nodes.
+
+        :param: nodes: Indices of the nodes in Morton order.
+        :return: Array of shape (len(nodes), 2) with the accumulated forces.
+        """
+        node_count = len(nodes)
+        fx_total = np.zeros(node_count)
+        fy_total = np.zeros(node_count)
+        node_x, node_y, node_mass = self.x[nodes], self.y[nodes], self.masses[nodes]
+
+        # Every pair consists of a local node index and a cell, starting with the root for every node
+        pair_nodes = np.arange(node_count)
+        pair_cells = np.zeros(node_count, dtype=np.intp)
+        while len(pair_nodes):
+            dx = self.center_of_mass_x[pair_cells] - node_x[pair_nodes]
+            dy = self.center_of_mass_y[pair_cells] - node_y[pair_nodes]
+            distance = np.maximum(np.hypot(dx, dy), self.MIN_DISTANCE)
+            approximated = self.cell_size[pair_cells] / distance < theta
+
+            # Sufficiently distant cells act as a single particle
+            force = -(node_mass[pair_nodes[approximated]] * self.total_mass[pair_cells[approximated]]
+                      / distance[approximated] ** 1.2) * force_modification / distance[approximated]
+            fx_total += np.bincount(pair_nodes[approximated], force * dx[approximated], node_count)
+            fy_total += np.bincount(pair_nodes[approximated], force * dy[approximated], node_count)
+
+            opened_nodes = pair_nodes[~approximated]
+            opened_cells = pair_cells[~approximated]
+            opened_children = self.children[opened_cells]
+            is_leaf = (opened_children < 0).all(axis=1)
+
+            # Leaf cells: direct interaction with every contained particle
+            leaf_nodes, leaf_cells = opened_nodes[is_leaf], opened_cells[is_leaf]
+            if len(leaf_nodes):
+                counts = self.node_end[leaf_cells] - self.node_start[leaf_cells]
+                direct_nodes = np.repeat(leaf_nodes, counts)
+                offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+                others = np.repeat(self.node_start[leaf_cells], counts) + offsets
+                fx, fy = self.__direct_forces(self.x[others] - node_x[direct_nodes],
+                                              self.y[others] - node_y[direct_nodes],
+                                              node_mass[direct_nodes] * self.masses[others], force_modification)
+                fx_total += np.bincount(direct_nodes, fx, node_count)
+                fy_total += np.bincount(direct_nodes, fy, node_count)
+
+            # Internal cells: continue with their children
+            inner_children = opened_children[~is_leaf]
+            existing = inner_children >= 0
+            pair_nodes = np.repeat(opened_nodes[~is_leaf], 4).reshape(-1, 4)[existing]
+            pair_cells = inner_children[existing]
+
+        return np.column_stack((fx_total, fy_total))
+
+    def __direct_forces(self, dx, dy, mass_products, force_modification):
+        """
+        Calculates the repulsion between particles without approximation. Particles on the same position
+        do not repel each other, which also excludes the interaction of a particle with itself.
+        """
+        distance = np.hypot(dx, dy)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            force = np.where(distance > self.MIN_DISTANCE,
+                             -(mass_products / distance ** 1.2) * force_modification / distance, 0.0)
+        return force * dx, force * dy
+
+    def __fill_cells(self, cells, start, end, grid_x, grid_y, depth,
+                     cumulative_mass, cumulative_mass_x, cumulative_mass_y):
+        """
+        Writes bounds, node range, total mass and center of mass of one level of cells into the cell arrays.
+        """
+        size = self.size / (1 << depth)
+        self.cell_size[cells] = size
+        self.cell_x[cells] = self.x_location + grid_x * size
+        self.cell_y[cells] = self.y_location + grid_y * size
+        self.node_start[cells] = start
+        self.node_end[cells] = end
+        self.children[cells] = -1
+
+        total_mass = cumulative_mass[end] - cumulative_mass[start]
+        safe_mass = np.where(total_mass > 0, total_mass, 1.0)
+        self.total_mass[cells] = total_mass
+        self.center_of_mass_x[cells] = self.x_location + (cumulative_mass_x[end] - cumulative_mass_x[start]) / safe_mass
+        self.center_of_mass_y[cells] = self.y_location + (cumulative_mass_y[end] - cumulative_mass_y[start]) / safe_mass
+
+    def __ensure_capacity(self, required_cells):
+        """
+        Grows the cell arrays if they cannot hold the required amount of cells. The capacity is doubled,
+        so the arrays are only reallocated a few times and are reused for later builds.
+        """
+        if required_cells <= self.__capacity:
+            return
+        capacity = max(required_cells, 2 * self.__capacity, 64)
+        for name in ('cell_x', 'cell_y', 'cell_size', 'total_mass', 'center_of_mass_x', 'center_of_mass_y'):
+            grown = np.zeros(capacity)
+            grown[:self.cell_count] = getattr(self, name)[:self.cell_count]
+            setattr(self, name, grown)
+        for name in ('node_start', 'node_end'):
+            grown = np.zeros(capacity, dtype=np.intp)
+            grown[:self.cell_count] = getattr(self, name)[:self.cell_count]
+            setattr(self, name, grown)
+        children = np.full((capacity, 4), -1, dtype=np.intp)
+        children[:self.cell_count] = self.children[:self.cell_count]
+        self.children = children
+        self.__capacity = capacity
+
+    @staticmethod
+    def __interleave_bits(values):
+        """
+        Spreads the lower 32 bits of each value so that a zero bit lies between every two bits (Morton code).
+        """
+        values = values & np.uint64(0xFFFFFFFF)
+        values = (values | (values << np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+        values = (values | (values << np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+        values = (values | (values << np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+        values = (values | (values << np.uint64(2))) & np.uint64(0x3333333333333333)
+        values = (values | (values << np.uint64(1))) & np.uint64(0x5555555555555555)
+        return values
@@ -1,34 +1,36 @@
-from GraphController.GraphLayoutHandler.QuadtreeBuilder import QuadtreeBuilder, BarnesHutNode
+from GraphController.GraphLayoutHandler.ArrayQuadtree import ArrayQuadtree
 from GraphModel.Node import Node
 import numpy as np
 
 
 class BarnesHutManager:
-    # Example:
-    quad_tree_builder = QuadtreeBuilder()
-
-    # Create a root barnes_hut_node representing the entire simulation space
-    root_node = BarnesHutNode(0, 0, 0)
+    # Quadtree representing the entire simulation space
+    quadtree: ArrayQuadtree
     x_location = 0
     y_location = 0
     barnes_hut_size = 100
 
-    def __init__(self, x_location, y_location, barnes_hut_size):
+    def __init__(self, x_location, y_location, barnes_hut_size, adaptive_bounds=True):
         """
 
         :param: x_location: x location of the Barnes Hut Area
         :param: y_location: total_height location of the Barnes Hut Area
         :param: barnes_hut_size: Used to calculate the max Area which is divided into quadrants.
+        :param: adaptive_bounds: If True, the Barnes Hut Area is fitted to the bounding box of the nodes on every
+            step and the fixed area above is ignored.
         """
         self.x_location = x_location
         self.y_location = y_location
         self.barnes_hut_size = barnes_hut_size
+        self.adaptive_bounds = adaptive_bounds
+        self.quadtree = ArrayQuadtree.for_area(x_location, y_location, barnes_hut_size, adaptive_bounds)
 
     def insert_nodes_into_quadtree(self, graph_nodes: [Node]):
-        self.root_node = BarnesHutNode(self.x_location, self.y_location, self.barnes_hut_size)
-        # Insert particles into the Barnes-Hut tree
-        for graph_node in graph_nodes:
-            self.quad_tree_builder.insert_node(self.root_node, graph_node)
+        node_count = len(graph_nodes)
+        # Build the Barnes-Hut tree from the positions of all particles
+        self.quadtree.build(np.fromiter((graph_node.x for graph_node in graph_nodes), float, node_count),
+                            np.fromiter((graph_node.y for graph_node in graph_nodes), float, node_count),
+                            np.fromiter((graph_node.mass for graph_node in graph_nodes), float, node_count))
 
     def barnes_hut_layout(self,
                           graph_nodes: [Node],
@@ -82,9 +84,9 @@ class BarnesHutManager:
            velocity to the specified maximum, if necessary.
            """
         for graph_node in graph_nodes:
-            disp_x, disp_y = self.quad_tree_builder.calculate_force(self.root_node, graph_node,
-                                                                    repulsion_force_modification,
-                                                                    barnes_hut_approximation_level)
+            disp_x, disp_y = self.quadtree.calculate_force(graph_node.x, graph_node.y, graph_node.mass,
+                                                           repulsion_force_modification,
+                                                           barnes_hut_approximation_level)
 
             # Initialize velocities and accelerations for nodes
             # graph_node.velocity_x = 0.0
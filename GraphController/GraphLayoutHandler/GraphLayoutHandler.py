@@ -1,12 +1,15 @@
 import time
 
+import numpy as np
 import pygame
 
 from GraphModel import Graph
+from GraphModel.NodeStore import NodeStore
 from View.GraphView import IScaleOffsetTransformer
 from .BarnesHutManager import BarnesHutManager
 from .IGraphLayoutHandler import IGraphLayoutHandler
-from .QuadtreeBuilder import BarnesHutNode
+from .LayoutWorker import LayoutWorker
+from .VectorizedBarnesHutManager import VectorizedBarnesHutManager
 
 
 class AutoLayoutHandler(IGraphLayoutHandler):
@@ -29,21 +32,40 @@ class AutoLayoutHandler(IGraphLayoutHandler):
                  scale_offset_transformer: IScaleOffsetTransformer,
                  screen,
                  draw_color,
-                 graph: Graph):
+                 graph: Graph,
+                 use_vectorized_engine: bool = True,
+                 adaptive_bounds: bool = True,
+                 parallel_workers: int = 0,
+                 run_in_background: bool = False,
+                 ticks_per_second: int = 60):
         """
         Initializes an AutoLayoutHandler instance.
 
-        :param: x_location: The x-coordinate for the Barnes-Hut quadtree root.
-        :param: y_location: The y-coordinate for the Barnes-Hut quadtree root.
-        :param: barnes_hut_size: The size of the Barnes-Hut quadtree area.
+        :param: x_location: The x-coordinate for the Barnes-Hut quadtree root, if adaptive_bounds is False.
+        :param: y_location: The y-coordinate for the Barnes-Hut quadtree root, if adaptive_bounds is False.
+        :param: barnes_hut_size: The size of the Barnes-Hut quadtree area, if adaptive_bounds is False.
         :param: scale_offset_transformer: An instance of IScaleOffsetTransformer for transforming coordinates.
         :param: screen: The Pygame screen object where the graph is rendered.
         :param: draw_color: The color used for drawing the Barnes-Hut area.
         :param: graph: The graph whose nodes will be arranged.
+        :param: use_vectorized_engine: If True, the NumPy based VectorizedBarnesHutManager is used to simulate the
+        layout. Otherwise, the object based BarnesHutManager is used.
+        :param: adaptive_bounds: If True, the quadtree root is fitted to the bounding box of the nodes on every step
+        instead of using the fixed area given above.
+        :param: parallel_workers: Amount of worker processes calculating the repulsion of large graphs. Only used by
+        the vectorized engine, 0 calculates the repulsion in the application process.
+        :param: run_in_background: If True, the simulation runs on a LayoutWorker thread decoupled from rendering.
+        Requires the vectorized engine.
+        :param: ticks_per_second: Maximum amount of simulation steps per second of the LayoutWorker.
         """
 
         self.graph = graph
-        self.barnesHutManager = BarnesHutManager(x_location, y_location, barnes_hut_size)
+        self.use_vectorized_engine = use_vectorized_engine
+        if use_vectorized_engine:
+            self.barnesHutManager = VectorizedBarnesHutManager(x_location, y_location, barnes_hut_size,
+                                                               adaptive_bounds, parallel_workers)
+        else:
+            self.barnesHutManager = BarnesHutManager(x_location, y_location, barnes_hut_size, adaptive_bounds)
         self.barnesHutManager.insert_nodes_into_quadtree(graph.nodes)
         self.scaleOffsetTransformer = scale_offset_transformer
         self.screen = screen
@@ -52,7 +74,28 @@ class AutoLayoutHandler(IGraphLayoutHandler):
         # Modifications for Auto Layout
         self.attraction_force_modification = 0.1
         self.repulsion_force_modification = len(graph.nodes)
+        self.barnes_hut_approximation_level = 3.0
         self.max_velocity = 5
+        self.time_step = 0.5
+
+        # Background simulation
+        self.layout_worker = None
+        self.__worker_generation = 0
+        self.__worker_topology_signature = None
+        self.__worker_node_indices = {}
+        self.__worker_nodes = []
+        self.__last_applied_snapshot = None
+        self.__move_sequence = 0
+        # Moves sent to the worker that are not yet part of an applied snapshot: (sequence, store indices, dx, dy)
+        self.__pending_moves = []
+        # Indices of the last moved nodes, reused while the same nodes are moved again, e.g. during a drag
+        self.__moved_nodes = None
+        self.__moved_worker_indices = np.zeros(0, dtype=np.intp)
+        self.__moved_store_indices = np.zeros(0, dtype=np.intp)
+        if run_in_background and use_vectorized_engine:
+            self.layout_worker = LayoutWorker(self.barnesHutManager, self.__get_step_parameters(), ticks_per_second)
+            self.__load_nodes_into_worker()
+            self.layout_worker.start()
 
     def auto_layout(self, pause_layout):
         """
@@ -64,7 +107,13 @@ class AutoLayoutHandler(IGraphLayoutHandler):
         It involves various calculations for arranging nodes and edges.
         The method also measures execution time and prints it to the console.
 
+        If the layout runs in the background, this method only pauses or resumes the LayoutWorker and applies the
+        latest published positions to the nodes.
         """
+        if self.layout_worker is not None:
+            self.__synchronize_with_worker(pause_layout)
+            return
+
         # GraphLayoutHandler on loop
         if not pause_layout:
             # Starte die Zeitmessung
@@ -74,45 +123,143 @@ class AutoLayoutHandler(IGraphLayoutHandler):
 
             # Suitable Force Relation for Graphs N = 800
             # self.barnesHutManager.barnes_hut_layout(self.graph.nodes, 0.05, 10.0, 3.0, 100, 0.9)
-            self.barnesHutManager.barnes_hut_layout(self.graph.nodes, self.attraction_force_modification,
-                                                    self.repulsion_force_modification, 3.0, self.max_velocity, 0.5)
+            self.barnesHutManager.barnes_hut_layout(self.graph.nodes, *self.__get_step_parameters())
+            self.graph.notify_positions_changed()
 
             # Beende die Zeitmessung
             # end_time = time.time()
             # Berechne die Differenz zwischen Start- und Endzeit, um die Ausführungszeit zu erhalten
             #execution_time = end_time - start_time
 
-            print("Die Ausführungszeit beträgt:", execution_time, "Sekunden")
+            # print("Die Ausführungszeit beträgt:", execution_time, "Sekunden")
 
-    def show_barnes_hut_area(self):
+    def nodes_moved(self, nodes, dx, dy):
         """
-        Request a visualisation of the Barnes Hut Areas.
+        Informs the layout that nodes have been moved outside the simulation, e.g. by dragging a subtree.
+
+        :param: nodes: The moved nodes.
+        :param: dx: The change in the x-coordinate.
+        :param: dy: The change in the y-coordinate.
+        """
+        self.graph.notify_positions_changed()
+        # Without a worker the positions are read from the nodes on every step anyway
+        if self.layout_worker is None:
+            return
+        self.__move_sequence += 1
+        if nodes is not self.__moved_nodes:
+            self.__moved_nodes = nodes
+            self.__moved_worker_indices = np.array([self.__worker_node_indices[id(node)] for node in nodes
+                                                    if id(node) in self.__worker_node_indices], dtype=np.intp)
+            self.__moved_store_indices = NodeStore.get_indices(nodes)
+        self.layout_worker.move(self.__move_sequence, self.__moved_worker_indices, dx, dy)
+        self.__pending_moves.append((self.__move_sequence, self.__moved_store_indices, dx, dy))
+
+    def shutdown(self):
+        """
+        Stops the background simulation and any worker processes.
+        """
+        if self.layout_worker is not None:
+            self.layout_worker.stop()
+            self.layout_worker = None
+        if self.use_vectorized_engine:
+            self.barnesHutManager.shutdown()
+
+    def __get_step_parameters(self):
+        """
+        Returns the parameters of a simulation step in the order of VectorizedBarnesHutManager.step.
+        """
+        return (self.attraction_force_modification, self.repulsion_force_modification,
+                self.barnes_hut_approximation_level, self.max_velocity, self.time_step)
+
+    def __load_nodes_into_worker(self):
+        """
+        Sends the current nodes of the graph to the LayoutWorker. Called initially and whenever nodes or connections
+        have been added, e.g. by an import.
         """
-        bhn = self.barnesHutManager.root_node
-        self.__visualize_barnes_hut_area(bhn)
+        nodes = list(self.graph.nodes)
+        positions, masses = VectorizedBarnesHutManager.read_positions(nodes)
+        edges = VectorizedBarnesHutManager.read_edges(nodes)
+        self.__worker_generation += 1
+        self.__worker_topology_signature = VectorizedBarnesHutManager.read_topology_signature(nodes)
+        self.__worker_nodes = nodes
+        self.__worker_node_indices = {id(node): index for index, node in enumerate(nodes)}
+        self.__moved_nodes = None
+        # The loaded positions already contain all previous moves
+        self.__pending_moves.clear()
+        self.layout_worker.step_parameters = self.__get_step_parameters()
+        self.layout_worker.load(self.__worker_generation, positions, masses, edges)
 
-    def __visualize_barnes_hut_area(self, bhn: BarnesHutNode):
+    def __synchronize_with_worker(self, pause_layout):
         """
-        Recursively draw the Barnes-Hut tree areas.
+        Pauses or resumes the LayoutWorker and writes its latest snapshot to the nodes. Moves that are not yet part
+        of the snapshot are applied again on top of it, so dragged nodes do not jump back.
 
-        :param: bhn: The Barnes-Hut node to draw.
+        :param: pause_layout: A flag indicating whether layout should be paused.
+        """
+        if VectorizedBarnesHutManager.read_topology_signature(self.graph.nodes) != self.__worker_topology_signature:
+            self.__load_nodes_into_worker()
+        self.layout_worker.set_paused(pause_layout)
+
+        snapshot = self.layout_worker.get_snapshot()
+        if snapshot is None:
+            return
+        generation, last_move, publish_counter, positions = snapshot
+        if generation != self.__worker_generation or publish_counter == self.__last_applied_snapshot:
+            return
+        self.__last_applied_snapshot = publish_counter
+
+        VectorizedBarnesHutManager.write_positions(self.__worker_nodes, positions)
+        self.__pending_moves = [move for move in self.__pending_moves if move[0] > last_move]
+        for _, store_indices, dx, dy in self.__pending_moves:
+            self.graph.node_store.translate(store_indices, dx, dy)
+        self.graph.notify_positions_changed()
+
+    def __get_quadtree_cells(self):
+        """
+        Returns a copy of the quadtree cells, see ArrayQuadtree.copy_cells. If the layout runs in the background,
+        the quadtree is rebuilt by the LayoutWorker on every step, so the cells published with its snapshots are
+        used instead of the live tree.
+        """
+        if self.layout_worker is not None:
+            self.layout_worker.request_quadtree_snapshots()
+            return self.layout_worker.get_quadtree_snapshot()
+        return self.barnesHutManager.quadtree.copy_cells()
+
+    def get_quadtree_statistics(self):
+        """
+        Returns the depth and the amount of cells of the current Barnes-Hut quadtree.
+
+        :return: Tuple (depth, cell_count), or None if the LayoutWorker has not published the quadtree yet.
+        """
+        cells = self.__get_quadtree_cells()
+        if cells is None:
+            return None
+        depth, cell_count, _, _, _ = cells
+        return depth, cell_count
+
+    def show_barnes_hut_area(self):
+        """
+        Request a visualisation of the Barnes Hut Areas.
         """
-        # Get scaled coordinates and size based on the zoom level.
-        scaled_x, scaled_y = self.scaleOffsetTransformer.get_scaled_coordinates(bhn)
-        scaled_size = int(bhn.size * self.scaleOffsetTransformer.zoom)
+        cells = self.__get_quadtree_cells()
+        if cells is None:
+            return
+        _, _, cell_x, cell_y, cell_size = cells
+        zoom = self.scaleOffsetTransformer.zoom
 
-        # Draw the current node as a square.
-        rect = pygame.Rect(scaled_x - scaled_size, scaled_y - scaled_size, 2 * scaled_size, 2 * scaled_size)
-        pygame.draw.rect(self.screen, self.draw_color, rect, 1)
+        # The cells are stored in flat arrays, so they are transformed at once and drawn in a single pass instead
+        # of recursively.
+        cell_x, cell_y = self.scaleOffsetTransformer.get_scaled_coordinate_arrays(cell_x, cell_y)
+        cell_size = (cell_size * zoom).astype(np.int64)
+        for scaled_x, scaled_y, scaled_size in zip(cell_x.tolist(), cell_y.tolist(), cell_size.tolist()):
+            half_size = scaled_size // 2
 
-        # Draw straight lines from the x and total_height positions
-        # to the edges of the quadrant based on 'size'.
-        pygame.draw.line(self.screen, self.draw_color, (scaled_x, scaled_y - scaled_size),
-                         (scaled_x, scaled_y + scaled_size))
-        pygame.draw.line(self.screen, self.draw_color, (scaled_x - scaled_size, scaled_y),
-                         (scaled_x + scaled_size, scaled_y))
+            # Draw the current cell as a square.
+            rect = pygame.Rect(scaled_x, scaled_y, scaled_size, scaled_size)
+            pygame.draw.rect(self.screen, self.draw_color, rect, 1)
 
-        # Draw the children, if they exist.
-        for child in bhn.children:
-            if child is not None:
-                self.__visualize_barnes_hut_area(child)
+            # Draw straight lines through the center of the cell to mark its quadrants.
+            pygame.draw.line(self.screen, self.draw_color, (scaled_x + half_size, scaled_y),
+                             (scaled_x + half_size, scaled_y + scaled_size))
+            pygame.draw.line(self.screen, self.draw_color, (scaled_x, scaled_y + half_size),
+                             (scaled_x + scaled_size, scaled_y + half_size))
@@ -0,0 +1,185 @@
+import tempfile
+import time
+
+from ComponentAssembly.GraphAnalyzer import GraphAnalyzer
+from GraphController.GraphExporter import GraphExporter
+from GraphController.GraphImporter import GraphImporter
+from GraphModel.Graph import Graph
+from .VectorizedBarnesHutManager import VectorizedBarnesHutManager
+
+
+class LayoutResult:
+    """
+    Summary of a headless layout run.
+    """
+    # Reasons why a run stopped
+    # The forces balance, so the nodes would hardly move even without the velocity limit
+    CONVERGED = "converged"
+    # The velocity limit was cooled down so far that no node can move by the displacement threshold anymore, but
+    # the forces do not balance
+    COOLED = "cooled"
+    # The iteration budget was used up
+    MAX_ITERATIONS = "max_iterations"
+
+    def __init__(self, iterations, wall_time, stop_reason, max_displacement, kinetic_energy,
+                 mean_unlimited_displacement):
+        """
+        :param: iterations: Amount of simulation steps that were run.
+        :param: wall_time: Duration of the run in seconds.
+        :param: stop_reason: Why the run stopped, one of CONVERGED, COOLED and MAX_ITERATIONS.
+        :param: max_displacement: The largest displacement of a single node in the last step.
+        :param: kinetic_energy: The total kinetic energy of the nodes after the last step.
+        :param: mean_unlimited_displacement: The mean displacement the forces of the last step would have caused
+        without the velocity limit.
+        """
+        self.iterations = iterations
+        self.wall_time = wall_time
+        self.stop_reason = stop_reason
+        self.converged = stop_reason == self.CONVERGED
+        self.max_displacement = max_displacement
+        self.kinetic_energy = kinetic_energy
+        self.mean_unlimited_displacement = mean_unlimited_displacement
+
+    def __str__(self):
+        stop_reasons = {
+            self.CONVERGED: "konvergiert",
+            self.COOLED: "durch Abkühlung beendet",
+            self.MAX_ITERATIONS: "Iterationsbudget erschöpft",
+        }
+        return (f"Iterationen: {self.iterations}, Laufzeit: {self.wall_time:.3f} Sekunden, "
+                f"Ergebnis: {stop_reasons[self.stop_reason]}, "
+                f"Maximale Verschiebung: {self.max_displacement:.4f}, Kinetische Energie: {self.kinetic_energy:.4f}, "
+                f"Mittlere Verschiebung ohne Begrenzung: {self.mean_unlimited_displacement:.4f}")
+
+
+class HeadlessLayoutRunner:
+    """
+    The HeadlessLayoutRunner computes the layout of a graph without a display. Unlike the AutoLayoutHandler, which
+    advances the layout by one step per frame while the user watches, it runs the VectorizedBarnesHutManager in a
+    loop until the layout has settled or an iteration budget is used up, and writes the final positions to the nodes
+    only once at the end.
+
+    The simulation has no damping, so without further measures the fastest nodes keep moving by max_velocity *
+    time_step in every step. The runner therefore cools the simulation: the maximum velocity is multiplied by
+    cooling_factor after every step, so large movements happen early and the movements get smaller as the
+    temperature falls.
+
+    Since cooling alone shrinks the actual displacements, convergence is judged on the displacement and kinetic
+    energy the forces would cause without the velocity limit. The run has converged once these fall below the
+    thresholds, i.e. the forces balance. If instead the velocity limit has been cooled down until no node can move
+    by the displacement threshold anymore (max_velocity * time_step < displacement_threshold), the run stops as
+    cooled: the layout no longer changes visibly, but it is not in equilibrium. With the default settings this
+    happens after 390 steps; the oscillating forces of larger graphs usually end this way.
+    """
+
+    def __init__(self,
+                 max_iterations=1000,
+                 displacement_threshold=0.05,
+                 kinetic_energy_threshold=None,
+                 attraction_force_modification=0.1,
+                 repulsion_force_modification=None,
+                 barnes_hut_approximation_level=3.0,
+                 max_velocity=5,
+                 time_step=0.5,
+                 cooling_factor=0.99,
+                 parallel_workers=0):
+        """
+        Initializes the HeadlessLayoutRunner. The force parameters default to the ones of the AutoLayoutHandler.
+
+        :param: max_iterations: Maximum amount of simulation steps.
+        :param: displacement_threshold: The layout has converged once the forces would move the nodes less than this
+        on average without the velocity limit. The run also stops as cooled once the velocity limit keeps all nodes
+        below this displacement. None disables both criteria.
+        :param: kinetic_energy_threshold: The layout has converged once the total kinetic energy of the nodes
+        without the velocity limit falls below this value. None disables this criterion.
+        :param: attraction_force_modification: Modification of the attraction force.
+        :param: repulsion_force_modification: Modification of the repulsion force. Defaults to the amount of nodes.
+        :param: barnes_hut_approximation_level: Opening angle θ of the Barnes-Hut algorithm.
+        :param: max_velocity: Maximum velocity of a node in the first step.
+        :param: time_step: Controlling the speed and position update.
+        :param: cooling_factor: Factor the maximum velocity is multiplied with after every step. 1 disables cooling,
+        so the run never stops as cooled.
+        :param: parallel_workers: Amount of worker processes calculating the repulsion of large graphs.
+        """
+        self.max_iterations = max_iterations
+        self.displacement_threshold = displacement_threshold
+        self.kinetic_energy_threshold = kinetic_energy_threshold
+        self.attraction_force_modification = attraction_force_modification
+        self.repulsion_force_modification = repulsion_force_modification
+        self.barnes_hut_approximation_level = barnes_hut_approximation_level
+        self.max_velocity = max_velocity
+        self.time_step = time_step
+        self.cooling_factor = cooling_factor
+        self.parallel_workers = parallel_workers
+
+    def layout_graph(self, graph: Graph):
+        """
+        Runs the layout on the nodes of the graph and writes the final positions to them.
+
+        :param: graph: The graph whose nodes will be arranged.
+        :return: A LayoutResult describing the run.
+        """
+        start_time = time.perf_counter()
+        barnes_hut_manager = VectorizedBarnesHutManager(0, 0, 0, adaptive_bounds=True,
+                                                        parallel_workers=self.parallel_workers)
+        repulsion_force_modification = self.repulsion_force_modification
+        if repulsion_force_modification is None:
+            repulsion_force_modification = len(graph.nodes)
+
+        iterations = 0
+        stop_reason = LayoutResult.MAX_ITERATIONS
+        max_displacement = 0.0
+        max_velocity = self.max_velocity
+        try:
+            barnes_hut_manager.load_nodes(graph.nodes)
+            while iterations < self.max_iterations and len(graph.nodes) > 0:
+                max_displacement = barnes_hut_manager.step(self.attraction_force_modification,
+                                                           repulsion_force_modification,
+                                                           self.barnes_hut_approximation_level,
+                                                           max_velocity,
+                                                           self.time_step)
+                iterations += 1
+                max_velocity *= self.cooling_factor
+                if self.__has_converged(barnes_hut_manager):
+                    stop_reason = LayoutResult.CONVERGED
+                    break
+                if (self.displacement_threshold is not None
+                        and max_velocity * self.time_step < self.displacement_threshold):
+                    stop_reason = LayoutResult.COOLED
+                    break
+            barnes_hut_manager.store_nodes(graph.nodes)
+            graph.notify_positions_changed()
+        finally:
+            barnes_hut_manager.shutdown()
+
+        return LayoutResult(iterations, time.perf_counter() - start_time, stop_reason, max_displacement,
+                            barnes_hut_manager.kinetic_energy, barnes_hut_manager.mean_unlimited_displacement)
+
+    def layout_zip(self, input_path, output_path):
+        """
+        Imports a ZIP file written by the GraphExporter, runs the layout and exports the positioned graph to a new
+        ZIP file. The images of the graph are passed through a temporary folder, so the resources folder of the
+        application is not touched.
+
+        :param: input_path: Path of the ZIP file to be imported.
+        :param: output_path: Path of the ZIP file to be written.
+        :return: A LayoutResult describing the run.
+        """
+        with tempfile.TemporaryDirectory() as resources_folder_path:
+            graph = GraphImporter(Graph(), resources_folder_path, GraphAnalyzer()).import_graph_from_zip(input_path)
+            if graph is None:
+                raise ValueError(f"{input_path} does not contain graph data")
+            result = self.layout_graph(graph)
+            GraphExporter(graph, resources_folder_path).export_graph_to_zip(output_path)
+        return result
+
+    def __has_converged(self, barnes_hut_manager: VectorizedBarnesHutManager):
+        """
+        Checks the convergence criteria on the values of the last step without the velocity limit, which are not
+        lowered by cooling.
+        """
+        if (self.displacement_threshold is not None
+                and barnes_hut_manager.mean_unlimited_displacement < self.displacement_threshold):
+            return True
+        return (self.kinetic_energy_threshold is not None
+                and barnes_hut_manager.unlimited_kinetic_energy < self.kinetic_energy_threshold)
@@ -14,4 +14,20 @@ class IGraphLayoutHandler(ABC):
     def show_barnes_hut_area(self):
         """
         Request a visualisation of the Barnes Hut Areas.
-        """
\ No newline at end of file
+        """
+
+    @abstractmethod
+    def nodes_moved(self, nodes, dx, dy):
+        """
+        Informs the layout that nodes have been moved outside the simulation, e.g. by dragging a subtree.
+
+        :param: nodes: The moved nodes.
+        :param: dx: The change in the x-coordinate.
+        :param: dy: The change in the y-coordinate.
+        """
+
+    @abstractmethod
+    def shutdown(self):
+        """
+        Stops any background work of the layout.
+        """
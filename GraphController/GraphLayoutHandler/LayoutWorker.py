@@ -0,0 +1,190 @@
+import queue
+import threading
+import time
+
+import numpy as np
+
+from .VectorizedBarnesHutManager import VectorizedBarnesHutManager
+
+
+class LayoutWorker(threading.Thread):
+    """
+    The LayoutWorker runs the simulation of a VectorizedBarnesHutManager on a background thread at its own tick rate,
+    so that slow layout steps do not lower the frame rate of the application.
+
+    The worker owns the simulation arrays of the manager. The application thread never touches them directly:
+    it sends commands (load nodes, move nodes) that the worker applies at the start of its next tick, and it reads
+    the simulated positions from double-buffered snapshots. Each move command carries a sequence number and each
+    snapshot reports the last move it includes, so moves that are not yet part of a snapshot can be re-applied
+    on top of it instead of being lost. The cells of the quadtree are published the same way once they have been
+    requested, e.g. to display the Barnes-Hut areas.
+    """
+
+    def __init__(self, barnes_hut_manager: VectorizedBarnesHutManager, step_parameters, ticks_per_second=60):
+        """
+        Initializes the LayoutWorker. The worker starts paused.
+
+        :param: barnes_hut_manager: The manager whose simulation is run on the worker thread.
+        :param: step_parameters: Tuple of the arguments passed to VectorizedBarnesHutManager.step.
+        :param: ticks_per_second: Maximum amount of simulation steps per second.
+        """
+        super().__init__(name="LayoutWorker", daemon=True)
+        self.barnes_hut_manager = barnes_hut_manager
+        self.step_parameters = step_parameters
+        self.tick_duration = 1 / ticks_per_second
+
+        self.__commands = queue.Queue()
+        self.__wake_up = threading.Event()
+        self.__running = True
+        self.__paused = True
+
+        # Double-buffered snapshot: the worker fills the back buffer and swaps it with the front buffer
+        self.__snapshot_lock = threading.Lock()
+        self.__buffers = [np.zeros((0, 2)), np.zeros((0, 2))]
+        self.__front_buffer = 0
+        # (load generation, last included move, publish counter) of the front buffer
+        self.__snapshot_state = None
+        self.__publish_counter = 0
+        self.__load_generation = None
+        self.__last_move = 0
+        # Copy of the quadtree cells of the last published step, see ArrayQuadtree.copy_cells
+        self.__publish_quadtree = False
+        self.__quadtree_snapshot = None
+
+    def run(self):
+        """
+        The loop of the worker thread. Applies pending commands, advances the simulation if it is not paused and
+        publishes a new snapshot whenever the positions have changed.
+        """
+        while self.__running:
+            tick_start = time.perf_counter()
+            positions_changed = self.__process_commands()
+
+            if not self.__paused and len(self.barnes_hut_manager.positions) > 0:
+                self.barnes_hut_manager.step(*self.step_parameters)
+                positions_changed = True
+
+            if positions_changed:
+                self.__publish_snapshot()
+
+            if self.__paused and self.__commands.empty():
+                # Sleep until a command arrives or the simulation is resumed
+                self.__wake_up.wait()
+                self.__wake_up.clear()
+            else:
+                time.sleep(max(0.0, self.tick_duration - (time.perf_counter() - tick_start)))
+
+    def load(self, generation, positions, masses, edges):
+        """
+        Replaces the simulated nodes.
+
+        :param: generation: Identifies the loaded nodes. Snapshots report the generation they belong to.
+        :param: positions: Array of shape (n, 2) with the positions of the nodes.
+        :param: masses: Array with the masses of the nodes.
+        :param: edges: Array of shape (m, 2) with the (source, target) index pairs of all connections.
+        """
+        self.__send(('load', generation, positions, masses, edges))
+
+    def move(self, sequence, indices, dx, dy):
+        """
+        Moves nodes of the simulation, e.g. because the user dragged them.
+
+        :param: sequence: Increasing number of the move. Snapshots report the last move they include.
+        :param: indices: Array with the indices of the moved nodes.
+        :param: dx: The change in the x-coordinate.
+        :param: dy: The change in the y-coordinate.
+        """
+        self.__send(('move', sequence, indices, dx, dy))
+
+    def set_paused(self, paused):
+        """
+        Pauses or resumes the simulation.
+
+        :param: paused: True to pause the simulation.
+        """
+        if self.__paused != paused:
+            self.__paused = paused
+            self.__wake_up.set()
+
+    def request_quadtree_snapshots(self):
+        """
+        Makes the worker publish a copy of the quadtree cells with every snapshot from now on.
+        """
+        if not self.__publish_quadtree:
+            self.__publish_quadtree = True
+            # Publishes the current cells even while the simulation is paused
+            self.__send(('publish',))
+
+    def stop(self):
+        """
+        Stops the worker thread and waits for it to finish.
+        """
+        self.__running = False
+        self.__wake_up.set()
+        if self.is_alive():
+            self.join()
+
+    def get_snapshot(self):
+        """
+        Returns a copy of the most recently published positions.
+
+        :return: Tuple (generation, last_move, publish_counter, positions) or None if nothing was published yet.
+        """
+        with self.__snapshot_lock:
+            if self.__snapshot_state is None:
+                return None
+            return self.__snapshot_state + (self.__buffers[self.__front_buffer].copy(),)
+
+    def get_quadtree_snapshot(self):
+        """
+        Returns the quadtree cells published with the most recent snapshot. The arrays are not modified afterwards.
+
+        :return: Tuple (depth, cell_count, cell_x, cell_y, cell_size) or None if no cells were published yet.
+        """
+        with self.__snapshot_lock:
+            return self.__quadtree_snapshot
+
+    def __send(self, command):
+        self.__commands.put(command)
+        self.__wake_up.set()
+
+    def __process_commands(self):
+        """
+        Applies all pending commands to the simulation arrays.
+
+        :return: True if any positions were changed.
+        """
+        positions_changed = False
+        while True:
+            try:
+                command = self.__commands.get_nowait()
+            except queue.Empty:
+                return positions_changed
+
+            if command[0] == 'load':
+                _, self.__load_generation, positions, masses, edges = command
+                self.barnes_hut_manager.set_arrays(positions, masses, edges)
+            elif command[0] == 'move':
+                _, self.__last_move, indices, dx, dy = command
+                if len(indices) > 0:
+                    self.barnes_hut_manager.positions[indices] += (dx, dy)
+            # A 'publish' command only requests a snapshot
+            positions_changed = True
+
+    def __publish_snapshot(self):
+        """
+        Copies the simulated positions into the back buffer and swaps it with the front buffer.
+        """
+        back_buffer = 1 - self.__front_buffer
+        positions = self.barnes_hut_manager.positions
+        if self.__buffers[back_buffer].shape != positions.shape:
+            self.__buffers[back_buffer] = np.empty_like(positions)
+        self.__buffers[back_buffer][...] = positions
+        quadtree_snapshot = self.barnes_hut_manager.quadtree.copy_cells() if self.__publish_quadtree else None
+
+        self.__publish_counter += 1
+        with self.__snapshot_lock:
+            self.__front_buffer = back_buffer
+            if quadtree_snapshot is not None:
+                self.__quadtree_snapshot = quadtree_snapshot
+            self.__snapshot_state = (self.__load_generation, self.__last_move, self.__publish_counter)
@@ -0,0 +1,153 @@
+import atexit
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from GraphController.GraphLayoutHandler.ArrayQuadtree import ArrayQuadtree
+
+
+class ParallelRepulsionCalculator:
+    """
+    The ParallelRepulsionCalculator distributes the repulsion calculation of an ArrayQuadtree over a pool of worker
+    processes. The arrays of the tree and an output array for the forces are placed in shared memory, so each step
+    only copies the arrays into the shared blocks and sends their names to the workers instead of pickling nodes.
+    Each worker calculates the forces of a contiguous range of nodes in Morton order and writes them into the
+    output array.
+    """
+    # Below this amount of nodes the overhead of the workers outweighs their benefit
+    MIN_PARALLEL_NODES = 5000
+    # Every worker gets several ranges, so that workers finishing early can take over remaining work
+    RANGES_PER_WORKER = 4
+
+    def __init__(self, worker_count=None, min_parallel_nodes=MIN_PARALLEL_NODES):
+        """
+        Initializes the ParallelRepulsionCalculator. The worker processes are only started on first use.
+
+        :param: worker_count: Amount of worker processes. Defaults to the amount of CPU cores.
+        :param: min_parallel_nodes: Graphs with fewer nodes are calculated in the calling process.
+        """
+        self.worker_count = worker_count or os.cpu_count() or 1
+        self.min_parallel_nodes = min_parallel_nodes
+        self.__executor = None
+        # Shared memory blocks by array name
+        self.__shared_blocks = {}
+
+    def calculate_forces(self, quadtree: ArrayQuadtree, force_modification=1.0, theta=3.0):
+        """
+        Calculate the repulsion force acting on the nodes the tree was built from.
+
+        :param: quadtree: The tree of the current node positions.
+        :param: force_modification: A scaling factor for the force calculation.
+        :param: theta: The threshold parameter for deciding whether to approximate distant clusters.
+        :return: Array of shape (n, 2) with the force acting on each node, in the order the nodes were passed
+        to the tree.
+        """
+        node_count = len(quadtree.x)
+        if node_count < self.min_parallel_nodes or self.worker_count < 2:
+            return quadtree.calculate_forces(force_modification, theta)
+
+        if self.__executor is None:
+            # Forking would copy the state of the application process, including SDL and the LayoutWorker thread.
+            # Spawned workers also share the resource tracker of this process, so attaching to a block in a worker
+            # does not register it a second time, and the block is only unlinked by shutdown.
+            self.__executor = ProcessPoolExecutor(self.worker_count, mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(self.shutdown)
+
+        descriptors = {name: self.__share_array(name, array) for name, array in quadtree.get_arrays().items()}
+        descriptors['forces'] = self.__share_array('forces', None, (node_count, 2))
+
+        boundaries = np.linspace(0, node_count, self.worker_count * self.RANGES_PER_WORKER + 1).astype(int)
+        futures = [self.__executor.submit(calculate_forces_in_worker, descriptors, int(start), int(end),
+                                          force_modification, theta)
+                   for start, end in zip(boundaries[:-1], boundaries[1:]) if end > start]
+        for future in futures:
+            future.result()
+
+        # The workers wrote the forces in Morton order
+        forces = np.empty((node_count, 2))
+        forces[quadtree.node_order] = self.__shared_view('forces', (node_count, 2), np.float64)
+        return forces
+
+    def shutdown(self):
+        """
+        Stops the worker processes and releases the shared memory.
+        """
+        if self.__executor is not None:
+            # Registered again with the next executor, so the handlers do not pile up
+            atexit.unregister(self.shutdown)
+            self.__executor.shutdown()
+            self.__executor = None
+        for block in self.__shared_blocks.values():
+            block.close()
+            block.unlink()
+        self.__shared_blocks.clear()
+
+    def __share_array(self, name, array, shape=None):
+        """
+        Copies an array into the shared memory block with the given name. The block is replaced by a larger one
+        if it is too small, otherwise it is reused.
+
+        :param: name: Name of the array.
+        :param: array: The array to copy, or None to only reserve a block of the given shape.
+        :param: shape: Shape of the reserved block if no array is given.
+        :return: Descriptor (block name, shape, dtype) used by the workers to attach to the array.
+        """
+        shape = array.shape if array is not None else shape
+        dtype = array.dtype if array is not None else np.dtype(np.float64)
+        required_bytes = max(int(np.prod(shape)) * dtype.itemsize, 1)
+
+        block = self.__shared_blocks.get(name)
+        if block is None or block.size < required_bytes:
+            if block is not None:
+                block.close()
+                block.unlink()
+            block = shared_memory.SharedMemory(create=True, size=2 * required_bytes)
+            self.__shared_blocks[name] = block
+
+        if array is not None:
+            self.__shared_view(name, shape, dtype)[...] = array
+        return block.name, shape, dtype.str
+
+    def __shared_view(self, name, shape, dtype):
+        """
+        Returns an array view on the shared memory block with the given name.
+        """
+        return np.ndarray(shape, dtype=dtype, buffer=self.__shared_blocks[name].buf)
+
+
+# Shared memory blocks a worker process is attached to, by array name
+_attached_blocks = {}
+
+
+def _attach_array(name, descriptor):
+    """
+    Returns a view on a shared array inside a worker process. Blocks stay attached between calls and are only
+    replaced if the calculator moved the array to a new block.
+    """
+    block_name, shape, dtype = descriptor
+    block = _attached_blocks.get(name)
+    if block is None or block.name != block_name:
+        if block is not None:
+            block.close()
+        block = shared_memory.SharedMemory(name=block_name)
+        _attached_blocks[name] = block
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def calculate_forces_in_worker(descriptors, start, end, force_modification, theta):
+    """
+    Calculates the repulsion forces of the nodes start to end (in Morton order) inside a worker process and writes
+    them into the shared output array.
+
+    :param: descriptors: Shared memory descriptors of the tree arrays and the output array.
+    :param: start: First index of the range in Morton order.
+    :param: end: End (exclusive) of the range in Morton order.
+    :param: force_modification: A scaling factor for the force calculation.
+    :param: theta: The threshold parameter for deciding whether to approximate distant clusters.
+    """
+    arrays = {name: _attach_array(name, descriptor) for name, descriptor in descriptors.items()}
+    quadtree = ArrayQuadtree.from_arrays(arrays)
+    arrays['forces'][start:end] = quadtree.calculate_sorted_forces(start, end, force_modification, theta)
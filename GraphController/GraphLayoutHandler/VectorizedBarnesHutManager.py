@@ -0,0 +1,253 @@
+import numpy as np
+
+from GraphController.GraphLayoutHandler.ArrayQuadtree import ArrayQuadtree
+from GraphController.GraphLayoutHandler.ParallelRepulsionCalculator import ParallelRepulsionCalculator
+from GraphModel.Adjacency import Adjacency
+from GraphModel.Node import Node
+from GraphModel.NodeStore import NodeStore
+
+
+class VectorizedBarnesHutManager:
+    """
+    The VectorizedBarnesHutManager is the struct-of-arrays counterpart of the BarnesHutManager. Positions, velocities,
+    accelerations and masses of all nodes are kept in contiguous NumPy arrays. Attraction is calculated over an edge
+    index array and repulsion for all nodes at once on an ArrayQuadtree, so that the Node objects are only touched
+    twice per step: once to read their positions and once to write the new positions back.
+    """
+    # Connected nodes closer than this distance do not attract each other
+    MIN_ATTRACTION_DISTANCE = 10
+
+    quadtree: ArrayQuadtree
+
+    def __init__(self, x_location, y_location, barnes_hut_size, adaptive_bounds=True, parallel_workers=0):
+        """
+        Initializes the VectorizedBarnesHutManager with empty simulation arrays.
+
+        :param: x_location: x location of the Barnes Hut Area
+        :param: y_location: y location of the Barnes Hut Area
+        :param: barnes_hut_size: Used to calculate the max Area which is divided into quadrants.
+        :param: adaptive_bounds: If True, the Barnes Hut Area is fitted to the bounding box of the nodes on every
+            step and the fixed area above is ignored.
+        :param: parallel_workers: If greater than 0, the repulsion of large graphs is calculated by this amount of
+            worker processes.
+        """
+        self.x_location = x_location
+        self.y_location = y_location
+        self.barnes_hut_size = barnes_hut_size
+        self.adaptive_bounds = adaptive_bounds
+        self.quadtree = ArrayQuadtree.for_area(x_location, y_location, barnes_hut_size, adaptive_bounds)
+        self.parallel_repulsion_calculator = None
+        if parallel_workers > 0:
+            self.parallel_repulsion_calculator = ParallelRepulsionCalculator(parallel_workers)
+
+        self.positions = np.zeros((0, 2))
+        self.velocities = np.zeros((0, 2))
+        self.accelerations = np.zeros((0, 2))
+        self.masses = np.zeros(0)
+        # Index pairs (source, target) of all connections
+        self.edges = np.zeros((0, 2), dtype=np.intp)
+        # Total kinetic energy of the nodes after the last step
+        self.kinetic_energy = 0.0
+        # Mean displacement and total kinetic energy the forces of the last step would have caused without the
+        # velocity limit. Unlike the limited values they do not fall just because max_velocity is lowered.
+        self.mean_unlimited_displacement = 0.0
+        self.unlimited_kinetic_energy = 0.0
+        self.__topology_signature = None
+
+    def insert_nodes_into_quadtree(self, graph_nodes: [Node]):
+        """
+        Loads the given nodes and builds their Barnes-Hut tree.
+
+        :param: graph_nodes: List of all Nodes
+        """
+        self.load_nodes(graph_nodes)
+        self.__build_quadtree()
+
+    def barnes_hut_layout(self,
+                          graph_nodes: [Node],
+                          attraction_force_modification,
+                          repulsion_force_modification,
+                          barnes_hut_approximation_level,
+                          max_velocity,
+                          time_step=0.9):
+        """
+        Application of repulsion and attraction effects to each node. Has the same signature as
+        BarnesHutManager.barnes_hut_layout, so both managers can be used interchangeably.
+
+        :param: graph_nodes: List of all Nodes
+        :param: attraction_force_modification: Modification of the Attraction Force a value lower than 1 will damp
+            force and a higher Value will amplify the force.
+        :param: repulsion_force_modification: Modification of the Repulsion Force a value lower than 1 will damp force
+            and a higher Value will amplify the force.
+        :param: barnes_hut_approximation_level: Opening angle θ of the Barnes-Hut algorithm.
+        :param: max_velocity: Maximum velocity of a Node to limit velocity to prevent excessive movements
+        :param: time_step: controlling the speed and position update
+        """
+        self.load_nodes(graph_nodes)
+        self.step(attraction_force_modification, repulsion_force_modification, barnes_hut_approximation_level,
+                  max_velocity, time_step)
+        self.store_nodes(graph_nodes)
+
+    def load_nodes(self, graph_nodes: [Node]):
+        """
+        Copies positions and masses of the nodes into the simulation arrays. The edge index array is only rebuilt
+        if the amount of nodes or connections has changed.
+
+        :param: graph_nodes: List of all Nodes
+        """
+        positions, masses = self.read_positions(graph_nodes)
+        topology_signature = self.read_topology_signature(graph_nodes)
+        edges = self.edges
+        if topology_signature != self.__topology_signature:
+            self.__topology_signature = topology_signature
+            edges = self.read_edges(graph_nodes)
+        self.set_arrays(positions, masses, edges)
+
+    def set_arrays(self, positions, masses, edges):
+        """
+        Replaces the simulation arrays, e.g. with arrays read by read_positions and read_edges on another thread.
+
+        :param: positions: Array of shape (n, 2) with the positions of the nodes.
+        :param: masses: Array with the masses of the nodes.
+        :param: edges: Array of shape (m, 2) with the (source, target) index pairs of all connections.
+        """
+        self.positions = positions
+        self.masses = masses
+        self.edges = edges
+        if len(self.velocities) != len(positions):
+            self.velocities = np.zeros_like(positions)
+            self.accelerations = np.zeros_like(positions)
+
+    def store_nodes(self, graph_nodes: [Node]):
+        """
+        Writes the simulated positions back to the nodes.
+
+        :param: graph_nodes: List of all Nodes, in the same order as they were loaded.
+        """
+        self.write_positions(graph_nodes, self.positions)
+
+    @staticmethod
+    def read_positions(graph_nodes: [Node]):
+        """
+        Reads positions and masses of the nodes into new arrays.
+
+        :param: graph_nodes: List of all Nodes
+        :return: Tuple of the positions (shape (n, 2)) and the masses of the nodes.
+        """
+        indices = NodeStore.get_indices(graph_nodes)
+        positions = np.empty((len(indices), 2))
+        positions[:, 0] = Node.store.read("x", indices)
+        positions[:, 1] = Node.store.read("y", indices)
+        masses = Node.store.read("mass", indices)
+        return positions, masses
+
+    @staticmethod
+    def write_positions(graph_nodes: [Node], positions):
+        """
+        Writes the given positions to the nodes.
+
+        :param: graph_nodes: List of all Nodes
+        :param: positions: Array of shape (n, 2) with one position per node.
+        """
+        indices = NodeStore.get_indices(graph_nodes)
+        Node.store.write("x", indices, positions[:, 0])
+        Node.store.write("y", indices, positions[:, 1])
+
+    @staticmethod
+    def read_topology_signature(graph_nodes: [Node]):
+        """
+        Returns the amount of nodes and the topology version of the NodeStore, which is incremented whenever a node
+        is created or connected. The signature changes whenever nodes or connections change.
+
+        :param: graph_nodes: List of all Nodes
+        """
+        return len(graph_nodes), Node.store.topology_version
+
+    @staticmethod
+    def read_edges(graph_nodes: [Node]):
+        """
+        Translates the connections of the nodes into an array of (source, target) index pairs.
+
+        :param: graph_nodes: List of all Nodes
+        """
+        return Adjacency.from_nodes(graph_nodes, Node.store).edges
+
+    def step(self, attraction_force_modification, repulsion_force_modification, barnes_hut_approximation_level,
+             max_velocity, time_step):
+        """
+        Advances the simulation by one time step on the loaded arrays.
+
+        Like in the BarnesHutManager, velocities and accelerations do not carry over from the previous step,
+        so nodes only move because of the forces of the current step. The total kinetic energy of the step is
+        stored in kinetic_energy, the values without the velocity limit in mean_unlimited_displacement and
+        unlimited_kinetic_energy.
+
+        :return: The largest displacement of a single node in this step.
+        """
+        if len(self.positions) == 0:
+            self.kinetic_energy = 0.0
+            self.mean_unlimited_displacement = 0.0
+            self.unlimited_kinetic_energy = 0.0
+            return 0.0
+
+        forces = self.__calculate_attraction_forces(attraction_force_modification)
+        self.__build_quadtree()
+        if self.parallel_repulsion_calculator is not None:
+            forces += self.parallel_repulsion_calculator.calculate_forces(self.quadtree, repulsion_force_modification,
+                                                                          barnes_hut_approximation_level)
+        else:
+            forces += self.quadtree.calculate_forces(repulsion_force_modification, barnes_hut_approximation_level)
+
+        self.accelerations = forces / self.masses[:, np.newaxis]
+        self.velocities = self.accelerations * time_step
+
+        # Limit velocity to prevent excessive movements
+        velocity_magnitude = np.hypot(self.velocities[:, 0], self.velocities[:, 1])
+        self.mean_unlimited_displacement = float(velocity_magnitude.mean() * time_step)
+        self.unlimited_kinetic_energy = float(0.5 * np.dot(self.masses, velocity_magnitude ** 2))
+        too_fast = velocity_magnitude > max_velocity
+        self.velocities[too_fast] *= (max_velocity / velocity_magnitude[too_fast])[:, np.newaxis]
+        velocity_magnitude[too_fast] = max_velocity
+        self.kinetic_energy = float(0.5 * np.dot(self.masses, velocity_magnitude ** 2))
+
+        displacement = self.velocities * time_step
+        self.positions += displacement
+        return float(np.hypot(displacement[:, 0], displacement[:, 1]).max())
+
+    def __calculate_attraction_forces(self, force_modification):
+        """
+        Calculate the attraction forces between connected nodes. The attraction is relative to the distance to
+        counter the effect of repulsion.
+
+        :param: force_modification: Modification value for the attractive force.
+        :return: Array of shape (n, 2) with the attraction force acting on each node.
+        """
+        node_count = len(self.positions)
+        forces = np.zeros((node_count, 2))
+        if len(self.edges) == 0:
+            return forces
+
+        sources, targets = self.edges[:, 0], self.edges[:, 1]
+        delta = self.positions[targets] - self.positions[sources]
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        attraction_force = np.where(distance > self.MIN_ATTRACTION_DISTANCE,
+                                    (force_modification ** 3) * distance * self.masses[sources], 0.0)
+        displacement = delta * attraction_force[:, np.newaxis]
+
+        for axis in range(2):
+            forces[:, axis] = (np.bincount(sources, displacement[:, axis], node_count)
+                               - np.bincount(targets, displacement[:, axis], node_count))
+        return forces
+
+    def __build_quadtree(self):
+        """
+        Rebuilds the Barnes-Hut tree from the current positions.
+        """
+        self.quadtree.build(self.positions[:, 0], self.positions[:, 1], self.masses)
+
+    def shutdown(self):
+        """
+        Stops the worker processes of the parallel repulsion calculation, if any.
+        """
+        if self.parallel_repulsion_calculator is not None:
+            self.parallel_repulsion_calculator.shutdown()
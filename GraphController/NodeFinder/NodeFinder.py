@@ -1,6 +1,5 @@
-import pygame
-
 from GraphModel import Graph
+from GraphModel.SpatialIndex import SpatialIndex
 from View.GraphView import ScaleOffsetTransformer
 
 
@@ -10,26 +9,24 @@ class NodeFinder:
     based on the given coordinates (x, total_height). It allows identifying a node
     that is in proximity to the specified position by comparing
     distances between coordinates and applying a tolerance threshold based
-    on the current zoom factor.
+    on the current zoom factor. The lookup is answered by a SpatialIndex instead of comparing the position
+    with every node.
     """
 
     graph: Graph
     scale_offset_transformer: ScaleOffsetTransformer
+    spatial_index: SpatialIndex
 
-    def __init__(self, graph, scale_offset_transformer):
+    def __init__(self, graph, scale_offset_transformer, spatial_index: SpatialIndex = None):
         self.graph = graph
         self.scale_offset_transformer = scale_offset_transformer
+        self.spatial_index = spatial_index if spatial_index is not None else SpatialIndex(graph)
 
     def find_node_at_position(self, x, y):
-        # Find the node located at the given position
-        for node in self.graph.nodes:
-            node_x = node.x
-            node_y = node.y
-            # Calculate the distance between the given coordinates (x, total_height) and the node's coordinates
-            distance = pygame.math.Vector2(x - node_x, y - node_y).length()
-            # Check if the distance is less than a certain threshold dependent on self.scale_offset_transformer.zoom
-            if distance < 8 / self.scale_offset_transformer.zoom:
-                # If the distance is less, return the current node
-                return node
-        # If no matching node is found, return None
-        return None
+        # Find the node closest to the given position within a threshold dependent on the zoom.
+        # If no matching node is found, None is returned.
+        return self.spatial_index.find_nearest_node(x, y, 8 / self.scale_offset_transformer.zoom)
+
+    def find_nodes_in_area(self, left, top, right, bottom):
+        # Find all nodes inside the given rectangle, e.g. for a box selection
+        return self.spatial_index.find_nodes_in_rectangle(left, top, right, bottom)
@@ -0,0 +1,119 @@
+import json
+
+
+class StreamingJsonReader:
+    """
+    The StreamingJsonReader reads a JSON object from a text file without loading the whole document into memory.
+    The file is read in chunks, and the elements of selected arrays are decoded one at a time and passed to a
+    callback, so only the element currently being decoded has to fit into memory. All other members of the object
+    are decoded as a whole and returned.
+    """
+    # Amount of characters read from the file at once
+    CHUNK_SIZE = 1 << 16
+    # Characters that can be part of a number
+    NUMBER_CHARACTERS = "0123456789+-.eE"
+
+    def __init__(self, file, chunk_size=CHUNK_SIZE):
+        """
+        Initializes the StreamingJsonReader at the current position of a file.
+
+        :param: file: A file opened in text mode, positioned at the start of the JSON object.
+        :param: chunk_size: The amount of characters read from the file at once.
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.__decoder = json.JSONDecoder()
+        self.__buffer = ""
+        self.__position = 0
+        self.__end_of_file = False
+
+    def read_object(self, array_callbacks):
+        """
+        Reads the JSON object. The elements of the arrays that are values of the given keys are passed to the
+        respective callback in their order, instead of being collected.
+
+        :param: array_callbacks: A dictionary mapping keys of the object to functions that take one element.
+        :return: A dictionary with all other members of the object.
+        :raises: json.JSONDecodeError: If the file does not contain a valid JSON object.
+        """
+        members = {}
+        self.__expect("{")
+        if self.__peek() == "}":
+            self.__position += 1
+            return members
+        while True:
+            key = self.__decode_value()
+            self.__expect(":")
+            if key in array_callbacks:
+                self.__read_array(array_callbacks[key])
+            else:
+                members[key] = self.__decode_value()
+            if self.__expect(",}") == "}":
+                return members
+
+    def __read_array(self, callback):
+        """
+        Reads an array and passes every element to the callback.
+        """
+        self.__expect("[")
+        if self.__peek() == "]":
+            self.__position += 1
+            return
+        while True:
+            callback(self.__decode_value())
+            if self.__expect(",]") == "]":
+                return
+
+    def __decode_value(self):
+        """
+        Decodes the next value. More of the file is read as long as the buffer ends within the value, or the value
+        is followed by a character that could continue a number, since a number cut off by the end of the buffer,
+        e.g. "1.5e" of "1.5e3", is decoded without an error. In valid JSON no such character follows a value.
+        """
+        self.__peek()
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buffer, self.__position)
+                if self.__end_of_file or (end < len(self.__buffer)
+                                          and self.__buffer[end] not in self.NUMBER_CHARACTERS):
+                    self.__position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.__end_of_file:
+                    raise
+            # Read at least as much as is already buffered, so a large value is not decoded again for every chunk
+            self.__read_more(max(self.chunk_size, len(self.__buffer) - self.__position))
+
+    def __expect(self, characters):
+        """
+        Skips whitespace and consumes the next character, which must be one of the given characters.
+
+        :return: The consumed character.
+        """
+        character = self.__peek()
+        if character == "" or character not in characters:
+            raise json.JSONDecodeError(f"Expecting one of {characters!r}", self.__buffer, self.__position)
+        self.__position += 1
+        return character
+
+    def __peek(self):
+        """
+        Skips whitespace and returns the next character without consuming it, or an empty string at the end of the
+        file.
+        """
+        while True:
+            while self.__position < len(self.__buffer) and self.__buffer[self.__position] in " \t\n\r":
+                self.__position += 1
+            if self.__position < len(self.__buffer) or self.__end_of_file:
+                return self.__buffer[self.__position:self.__position + 1]
+            self.__read_more(self.chunk_size)
+
+    def __read_more(self, size):
+        """
+        Appends the next characters of the file to the buffer and drops the part that has already been consumed.
+        """
+        chunk = self.file.read(size)
+        if not chunk:
+            self.__end_of_file = True
+        self.__buffer = self.__buffer[self.__position:] + chunk
+        self.__position = 0
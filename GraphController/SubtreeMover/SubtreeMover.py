@@ -1,4 +1,7 @@
-from collections import deque
+import numpy as np
+
+from GraphModel.Graph import Graph
+from GraphModel.NodeStore import NodeStore
 
 
 class SubtreeMover:
@@ -6,10 +9,26 @@ class SubtreeMover:
     The SubtreeMover class is responsible for handling the movement of a node and its connected subtree
     within a graph. It provides functionality to move a selected node along with all its connected child nodes,
     maintaining the relative positions within the subtree.
+
+    The subtree of the dragged node is found once, when the first move of a drag arrives, and kept until another
+    node is dragged or the connections of the graph change. Every move then only shifts the positions of the nodes
+    of the subtree in the NodeStore in one step.
     """
 
-    def __init__(self):
-        pass
+    graph: Graph
+
+    def __init__(self, graph: Graph):
+        """
+        Initializes the SubtreeMover.
+
+        :param: graph: The graph whose nodes are moved.
+        """
+        self.graph = graph
+        # The subtree of the last dragged node and the topology it was found in
+        self.__drag_node = None
+        self.__drag_topology_version = None
+        self.__drag_nodes = []
+        self.__drag_store_indices = np.zeros(0, dtype=np.intp)
 
     def move_selected_node_subtree(self, node_to_move, dx, dy):
         """
@@ -18,32 +37,36 @@ class SubtreeMover:
         :param: node_to_move: The node to be moved, along with its subtree.
         :param: dx: The change in the x-coordinate for the movement.
         :param: dy: The change in the y-coordinate for the movement.
+        :return: The list of moved nodes. It is the same list object for all moves of a drag.
 
-        This method updates the position of the specified node and recursively moves all connected nodes (its subtree),
-        ensuring the entire structure is translated by the same offset.
+        This method updates the position of the specified node and all nodes reachable over its connections (its
+        subtree), ensuring the entire structure is translated by the same offset.
         """
         if node_to_move is None:
+            return []
+
+        self.__ensure_drag_set(node_to_move)
+        self.graph.node_store.translate(self.__drag_store_indices, dx, dy)
+        return self.__drag_nodes
+
+    def __ensure_drag_set(self, node_to_move):
+        """
+        Finds the subtree of the node if it has not been found for the current topology of the graph yet.
+        """
+        topology_version = self.graph.get_topology_version()
+        if node_to_move is self.__drag_node and topology_version == self.__drag_topology_version:
             return
 
-        # Update the position of the selected node
-        node_to_move.x += dx
-        node_to_move.y += dy
-
-        # Use a queue to process child nodes
-        queue = deque()
-        queue.extend(node_to_move.get_connected_nodes().values())
-
-        # Use a set to track visited nodes
-        visited_nodes = {node_to_move}
-
-        while queue:
-            child = queue.popleft()
-            # Check if Child Node has been visited
-            if child not in visited_nodes:
-                # Move the child node
-                child.x += dx
-                child.y += dy
-                # Add the child node's children to the queue for processing
-                queue.extend(child.get_connected_nodes().values())
-                # Add the child node to the set of visited nodes
-                visited_nodes.add(child)
+        nodes = self.graph.nodes
+        store_indices = NodeStore.get_indices(nodes)
+        positions = np.flatnonzero(store_indices == node_to_move.index)
+        if len(positions) == 0:
+            # A node that is not part of the graph is moved alone
+            self.__drag_nodes = [node_to_move]
+            self.__drag_store_indices = np.array([node_to_move.index], dtype=np.intp)
+        else:
+            subtree = np.concatenate(self.graph.get_adjacency().get_bfs_layers(int(positions[0])))
+            self.__drag_nodes = [nodes[index] for index in subtree.tolist()]
+            self.__drag_store_indices = store_indices[subtree]
+        self.__drag_node = node_to_move
+        self.__drag_topology_version = topology_version
@@ -0,0 +1,115 @@
+import numpy as np
+
+from GraphModel.NodeStore import NodeStore
+
+
+class Adjacency:
+    """
+    The Adjacency holds the connections of the nodes of a graph in compressed sparse row form. The outgoing
+    connections of node i are neighbors[offsets[i]:offsets[i + 1]], its incoming connections are
+    reverse_neighbors[reverse_offsets[i]:reverse_offsets[i + 1]]. All indices refer to the position of the nodes in
+    the list of nodes the Adjacency was built from. The connections of a node keep the order they were made in.
+
+    The arrays must not be modified, since the Adjacency is shared until the connections change.
+    """
+
+    def __init__(self, node_count, sources, targets):
+        """
+        Builds the Adjacency from a list of connections.
+
+        :param: node_count: The amount of nodes.
+        :param: sources: Array with the index of the node each connection starts at.
+        :param: targets: Array with the index of the connected node of each connection.
+        """
+        self.node_count = node_count
+        self.offsets, order = self.__compress(node_count, sources)
+        self.neighbors = targets[order]
+        self.reverse_offsets, reverse_order = self.__compress(node_count, targets)
+        self.reverse_neighbors = sources[reverse_order]
+        # (source, target) pairs of all connections, ordered by source
+        self.edges = np.column_stack((sources[order], self.neighbors))
+
+    @classmethod
+    def from_nodes(cls, nodes, node_store: NodeStore):
+        """
+        Builds the Adjacency of the given nodes from the connections logged in the NodeStore. Connections to nodes
+        that are not in the list are left out.
+
+        :param: nodes: List of Nodes.
+        :param: node_store: The NodeStore of the nodes.
+        """
+        store_indices = NodeStore.get_indices(nodes)
+        sources, targets = node_store.read_edges()
+        store_size = max(int(store_indices.max(initial=-1)), int(sources.max(initial=-1)),
+                         int(targets.max(initial=-1))) + 1
+        # Position of every node in the list by its index in the store, -1 for nodes not in the list
+        list_indices = np.full(store_size, -1, dtype=np.intp)
+        list_indices[store_indices] = np.arange(len(nodes))
+        sources, targets = list_indices[sources], list_indices[targets]
+        in_list = (sources >= 0) & (targets >= 0)
+        return cls(len(nodes), sources[in_list], targets[in_list])
+
+    def get_neighbors(self, index):
+        """
+        Returns the indices of the nodes the given node is connected to.
+
+        :param: index: The index of the node.
+        """
+        return self.neighbors[self.offsets[index]:self.offsets[index + 1]]
+
+    def get_reverse_neighbors(self, index):
+        """
+        Returns the indices of the nodes that are connected to the given node.
+
+        :param: index: The index of the node.
+        """
+        return self.reverse_neighbors[self.reverse_offsets[index]:self.reverse_offsets[index + 1]]
+
+    def get_neighbors_of_nodes(self, indices):
+        """
+        Returns the indices of the nodes the given nodes are connected to, concatenated in the order of the given
+        nodes. A node connected to several of them is contained several times.
+
+        :param: indices: Array with the indices of the nodes.
+        """
+        starts = self.offsets[indices]
+        counts = self.offsets[indices + 1] - starts
+        # Position of every neighbor in self.neighbors: the start of its row plus its position within the row
+        row_starts_in_result = np.cumsum(counts) - counts
+        positions = np.repeat(starts - row_starts_in_result, counts) + np.arange(int(counts.sum()))
+        return self.neighbors[positions]
+
+    def get_bfs_layers(self, start, max_hops=None):
+        """
+        Follows the connections from a node breadth first and returns the reached nodes grouped by their distance.
+
+        :param: start: The index of the node to start at.
+        :param: max_hops: The largest distance to follow, or None to follow all connections.
+        :return: List of arrays, the first containing only start, the i-th the nodes at a distance of i connections.
+        """
+        visited = np.zeros(self.node_count, dtype=bool)
+        visited[start] = True
+        layers = [np.array([start], dtype=np.intp)]
+        while max_hops is None or len(layers) <= max_hops:
+            candidates = self.get_neighbors_of_nodes(layers[-1])
+            layer = np.unique(candidates[~visited[candidates]])
+            if len(layer) == 0:
+                break
+            visited[layer] = True
+            layers.append(layer)
+        return layers
+
+    def get_edge_count(self):
+        """
+        Returns the amount of connections.
+        """
+        return len(self.neighbors)
+
+    @staticmethod
+    def __compress(node_count, rows):
+        """
+        Returns the row offsets and the order that sorts the connections by row, keeping the order within a row.
+        """
+        offsets = np.zeros(node_count + 1, dtype=np.intp)
+        np.cumsum(np.bincount(rows, minlength=node_count), out=offsets[1:])
+        return offsets, np.argsort(rows, kind='stable')
@@ -1,6 +1,8 @@
 import random
 
+from GraphModel.Adjacency import Adjacency
 from GraphModel.Node import Node
+from GraphModel.NodeStore import NodeStore
 
 
 class Graph:
@@ -16,6 +18,14 @@ class Graph:
     INITIAL_CENTER_POSITION = 5000000
     # List to store all nodes in the graph
     nodes = []
+    # Positions, masses and simulation state of the nodes in compact arrays, shared like the list of nodes
+    node_store: NodeStore = Node.store
+    # Incremented whenever positions of nodes change, so derived data like the SpatialIndex is rebuilt lazily.
+    # Shared between all Graph instances like the list of nodes.
+    position_version = 0
+
+    __adjacency = None
+    __adjacency_version = None
 
     def add_new_node_to_graph(self, node: Node):
         """
@@ -27,3 +37,27 @@ class Graph:
         node.x = random.randint(self.INITIAL_CENTER_POSITION - 5, self.INITIAL_CENTER_POSITION + 5)
         node.y = random.randint(self.INITIAL_CENTER_POSITION - 5, self.INITIAL_CENTER_POSITION + 5)
         self.nodes.append(node)
+        self.notify_positions_changed()
+
+    def notify_positions_changed(self):
+        """
+        Marks the positions of the nodes as changed. Must be called by everything that moves nodes.
+        """
+        Graph.position_version += 1
+
+    def get_topology_version(self):
+        """
+        Returns a value that changes whenever nodes are created, added to or removed from the graph, or connected.
+        """
+        return self.node_store.topology_version, len(self.nodes)
+
+    def get_adjacency(self):
+        """
+        Returns the connections of the nodes as an Adjacency, whose indices refer to the positions of the nodes in
+        the list of nodes. It is rebuilt on the first request after the topology has changed.
+        """
+        topology_version = self.get_topology_version()
+        if self.__adjacency is None or topology_version != self.__adjacency_version:
+            self.__adjacency = Adjacency.from_nodes(self.nodes, self.node_store)
+            self.__adjacency_version = topology_version
+        return self.__adjacency
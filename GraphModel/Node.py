@@ -1,13 +1,47 @@
 import uuid
 
+from GraphModel.NodeStore import NodeStore
+
+
+def _stored_value(store: NodeStore, field):
+    """
+    Creates a property that reads and writes a value of the node in the NodeStore.
+    """
+    column = store.get_column(field)
+
+    def get_value(node):
+        return column[node.index]
+
+    def set_value(node, value):
+        column[node.index] = value
+
+    return property(get_value, set_value, doc=f"The {field} value of the node, kept in the NodeStore.")
+
 
 class Node:
     """
     The Node class represents a single node in a graph. It encapsulates various attributes of a node,
     such as its position, image representation, and connections to other nodes. This class is fundamental
     in graph structures, providing the basic building block for representing entities within the graph.
+
+    To keep large graphs small in memory, a node has no instance dictionary and its numeric values (position, mass
+    and the state of the layout simulation) are kept in the NodeStore shared by all nodes. The node only holds its
+    index into the store, the properties x, y, mass, etc. read and write the values there.
     """
-    image_name = "image_placeholder.png"
+    __slots__ = ("uuid", "description", "titel", "image_name", "index", "__connected_nodes")
+
+    # Numeric values of all nodes
+    store = NodeStore()
+
+    x = _stored_value(store, "x")
+    y = _stored_value(store, "y")
+    mass = _stored_value(store, "mass")
+    disp_x = _stored_value(store, "disp_x")
+    disp_y = _stored_value(store, "disp_y")
+    velocity_x = _stored_value(store, "velocity_x")
+    velocity_y = _stored_value(store, "velocity_y")
+    acceleration_x = _stored_value(store, "acceleration_x")
+    acceleration_y = _stored_value(store, "acceleration_y")
 
     def __init__(self, description, titel, image_name="image_placeholder.png", x=0, y=0):
         """
@@ -20,24 +54,30 @@ class Node:
         :param: x: The x-coordinate of the node in the graph. Defaults to 0.
         :param: y: The y-coordinate of the node in the graph. Defaults to 0.
         """
+        self.index = self.store.allocate()
         self.uuid = uuid.uuid4()
         self.description = description
         self.titel = titel
         self.x = x
         self.y = y
-        self.__connected_nodes = {}
-        self.disp_x = 0
-        self.disp_y = 0
-        self.mass = 1
-        self.velocity_x = 0.0
-        self.velocity_y = 0.0
-        self.acceleration_x = 0.0
-        self.acceleration_y = 0.0
+        # Most nodes have only few connections, the dictionary is created with the first one
+        self.__connected_nodes = None
         self.image_name = image_name
 
+    def __del__(self):
+        store = Node.store
+        index = getattr(self, "index", None)
+        if store is not None and index is not None:
+            store.release(index)
+
     def connect(self, other_node):
+        if self.__connected_nodes is None:
+            self.__connected_nodes = {}
         if other_node.uuid not in self.__connected_nodes:
             self.__connected_nodes[other_node.uuid] = other_node
+            self.store.add_edge(self.index, other_node.index)
 
     def get_connected_nodes(self):
+        if self.__connected_nodes is None:
+            return {}
         return self.__connected_nodes
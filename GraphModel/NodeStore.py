@@ -0,0 +1,166 @@
+import threading
+from array import array
+
+import numpy as np
+
+
+class NodeStore:
+    """
+    The NodeStore holds the numeric values of all nodes, i.e. their positions, masses and the state of the layout
+    simulation, in one compact array per value instead of one Python float object per value and node. A Node only
+    keeps its index into these arrays.
+
+    The arrays grow when nodes are created, and the index of a node that is garbage collected is reused for the next
+    node. Values of many nodes can be read and written at once as NumPy arrays.
+
+    The store also logs every connection between two nodes as a pair of indices, from which the Graph builds its
+    adjacency arrays. topology_version is incremented whenever nodes are created or connected, so derived data can
+    be rebuilt lazily.
+    """
+    # The values stored for every node and the value a new node starts with
+    FIELDS = {
+        "x": 0.0,
+        "y": 0.0,
+        "mass": 1.0,
+        "disp_x": 0.0,
+        "disp_y": 0.0,
+        "velocity_x": 0.0,
+        "velocity_y": 0.0,
+        "acceleration_x": 0.0,
+        "acceleration_y": 0.0,
+    }
+
+    def __init__(self):
+        """
+        Initializes an empty NodeStore.
+        """
+        self.__columns = {field: array('d') for field in self.FIELDS}
+        self.__free_indices = []
+        # Indices of collected nodes whose connections still have to be removed before the index is reused
+        self.__released_indices = []
+        # Source and target index of every connection in the order the connections were made
+        self.__edge_sources = array('q')
+        self.__edge_targets = array('q')
+        self.topology_version = 0
+        # An array cannot grow while NumPy reads or writes its buffer. Reentrant, since the garbage collector can
+        # release nodes on the thread that holds the lock.
+        self.__lock = threading.RLock()
+
+    def get_column(self, field):
+        """
+        Returns the array holding one value of all nodes. The array object stays the same while the store grows, so
+        it can be kept for fast access by index. It must not be resized.
+
+        :param: field: The name of the value, one of FIELDS.
+        """
+        return self.__columns[field]
+
+    def allocate(self):
+        """
+        Reserves the values of a new node, set to their initial values.
+
+        :return: The index of the node.
+        """
+        with self.__lock:
+            self.topology_version += 1
+            if self.__released_indices:
+                self.__remove_released_edges()
+            if self.__free_indices:
+                index = self.__free_indices.pop()
+                for field, initial_value in self.FIELDS.items():
+                    self.__columns[field][index] = initial_value
+                return index
+            for field, initial_value in self.FIELDS.items():
+                self.__columns[field].append(initial_value)
+            return len(self.__columns["x"]) - 1
+
+    def release(self, index):
+        """
+        Marks the values of a node that no longer exists as free for reuse.
+
+        :param: index: The index of the node.
+        """
+        with self.__lock:
+            self.__released_indices.append(index)
+
+    def add_edge(self, source, target):
+        """
+        Logs a connection from one node to another.
+
+        :param: source: The index of the node the connection starts at.
+        :param: target: The index of the connected node.
+        """
+        with self.__lock:
+            self.__edge_sources.append(source)
+            self.__edge_targets.append(target)
+            self.topology_version += 1
+
+    def read_edges(self):
+        """
+        Returns all logged connections.
+
+        :return: Tuple of two new arrays with the source and the target index of every connection.
+        """
+        with self.__lock:
+            return (np.array(np.frombuffer(self.__edge_sources, dtype=np.int64), dtype=np.intp),
+                    np.array(np.frombuffer(self.__edge_targets, dtype=np.int64), dtype=np.intp))
+
+    def __remove_released_edges(self):
+        """
+        Removes the connections of all released nodes from the log and frees their indices for reuse. It is done once
+        for all nodes collected since the last allocation, e.g. after the nodes of a graph have been replaced.
+        """
+        released_indices, self.__released_indices = self.__released_indices, []
+        released = np.array(released_indices, dtype=np.int64)
+        sources = np.frombuffer(self.__edge_sources, dtype=np.int64)
+        targets = np.frombuffer(self.__edge_targets, dtype=np.int64)
+        kept = ~(np.isin(sources, released) | np.isin(targets, released))
+        kept_sources, kept_targets = sources[kept], targets[kept]
+        # The buffers must not be exported while the logs are replaced
+        del sources, targets
+        self.__edge_sources = array('q', kept_sources.tobytes())
+        self.__edge_targets = array('q', kept_targets.tobytes())
+        self.__free_indices.extend(released_indices)
+
+    def read(self, field, indices):
+        """
+        Reads one value of many nodes.
+
+        :param: field: The name of the value, one of FIELDS.
+        :param: indices: Array with the indices of the nodes.
+        :return: A new array with the values in the order of the indices.
+        """
+        with self.__lock:
+            return np.frombuffer(self.__columns[field], dtype=float)[indices]
+
+    def write(self, field, indices, values):
+        """
+        Writes one value of many nodes.
+
+        :param: field: The name of the value, one of FIELDS.
+        :param: indices: Array with the indices of the nodes.
+        :param: values: Array with one value per index.
+        """
+        with self.__lock:
+            np.frombuffer(self.__columns[field], dtype=float)[indices] = values
+
+    def translate(self, indices, dx, dy):
+        """
+        Moves many nodes by the same offset.
+
+        :param: indices: Array with the indices of the nodes.
+        :param: dx: The change in the x-coordinate.
+        :param: dy: The change in the y-coordinate.
+        """
+        with self.__lock:
+            np.frombuffer(self.__columns["x"], dtype=float)[indices] += dx
+            np.frombuffer(self.__columns["y"], dtype=float)[indices] += dy
+
+    @staticmethod
+    def get_indices(nodes):
+        """
+        Returns the indices of the given nodes as an array, e.g. for read and write.
+
+        :param: nodes: List of Nodes.
+        """
+        return np.fromiter((node.index for node in nodes), np.intp, len(nodes))
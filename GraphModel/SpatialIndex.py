@@ -0,0 +1,205 @@
+import math
+
+import numpy as np
+
+from GraphModel.Graph import Graph
+from GraphModel.NodeStore import NodeStore
+
+
+class SpatialIndex:
+    """
+    The SpatialIndex is a uniform grid over the positions of the nodes of a graph, used to answer hit-tests,
+    nearest-node and rectangle queries without looking at every node.
+
+    The nodes are sorted by the key of the grid cell they lie in, so the nodes of a column of cells form a contiguous
+    range that is found by a binary search. The grid is rebuilt lazily on the first query after the positions or the
+    amount of nodes of the graph have changed, which is tracked by Graph.position_version.
+    """
+    # Smallest edge length of a cell, so that nodes on the same position do not produce an empty grid
+    MIN_CELL_SIZE = 1.0
+
+    graph: Graph
+
+    def __init__(self, graph: Graph):
+        """
+        Initializes the SpatialIndex. The grid is built on the first query.
+
+        :param: graph: The graph whose nodes are indexed.
+        """
+        self.graph = graph
+        self.__built_version = None
+        self.__nodes = []
+        self.__index_of_node = None
+        self.__x = np.zeros(0)
+        self.__y = np.zeros(0)
+        # Cell key of every node in ascending order and the node indices in the same order
+        self.__sorted_keys = np.zeros(0, dtype=np.int64)
+        self.__sorted_indices = np.zeros(0, dtype=np.intp)
+        self.__min_x = 0.0
+        self.__min_y = 0.0
+        self.__cell_size = self.MIN_CELL_SIZE
+        self.__columns = 1
+        self.__rows = 1
+
+    def find_nearest_node(self, x, y, max_distance=None):
+        """
+        Returns the node closest to the given position.
+
+        :param: x: The x-coordinate of the position.
+        :param: y: The y-coordinate of the position.
+        :param: max_distance: Only nodes closer than this distance are considered. None considers all nodes.
+        :return: The closest node, or None if there is no node within max_distance.
+        """
+        self.__ensure_current()
+        if len(self.__nodes) == 0:
+            return None
+
+        if max_distance is None:
+            # Grow the search radius until a node is found, then search once more with the distance of that node,
+            # since a node in a neighbouring cell may be closer.
+            radius = self.__cell_size
+            while True:
+                indices = self.find_node_indices_in_rectangle(x - radius, y - radius, x + radius, y + radius)
+                if len(indices) > 0 or radius > self.__get_extent():
+                    break
+                radius *= 2
+            if len(indices) == 0:
+                indices = np.arange(len(self.__nodes))
+            distances = np.hypot(self.__x[indices] - x, self.__y[indices] - y)
+            max_distance = float(distances.min()) * (1 + 1e-9)
+
+        indices = self.find_node_indices_in_rectangle(x - max_distance, y - max_distance,
+                                                      x + max_distance, y + max_distance)
+        if len(indices) == 0:
+            return None
+        distances = np.hypot(self.__x[indices] - x, self.__y[indices] - y)
+        nearest = int(np.argmin(distances))
+        if distances[nearest] > max_distance:
+            return None
+        return self.__nodes[indices[nearest]]
+
+    def find_nodes_in_radius(self, x, y, radius):
+        """
+        Returns all nodes within the given distance of a position.
+
+        :param: x: The x-coordinate of the position.
+        :param: y: The y-coordinate of the position.
+        :param: radius: The maximum distance of the nodes.
+        :return: List of the nodes.
+        """
+        self.__ensure_current()
+        indices = self.find_node_indices_in_rectangle(x - radius, y - radius, x + radius, y + radius)
+        indices = indices[np.hypot(self.__x[indices] - x, self.__y[indices] - y) <= radius]
+        return [self.__nodes[index] for index in indices.tolist()]
+
+    def find_nodes_in_rectangle(self, left, top, right, bottom):
+        """
+        Returns all nodes inside the given rectangle, e.g. for a box selection.
+
+        :param: left: The smallest x-coordinate of the rectangle.
+        :param: top: The smallest y-coordinate of the rectangle.
+        :param: right: The largest x-coordinate of the rectangle.
+        :param: bottom: The largest y-coordinate of the rectangle.
+        :return: List of the nodes.
+        """
+        self.__ensure_current()
+        indices = self.find_node_indices_in_rectangle(min(left, right), min(top, bottom),
+                                                      max(left, right), max(top, bottom))
+        return [self.__nodes[index] for index in indices.tolist()]
+
+    def get_positions(self):
+        """
+        Returns the indexed nodes and their positions, rebuilt if they have changed.
+
+        :return: Tuple (nodes, x, y) of the list of nodes and two arrays with their coordinates.
+        """
+        self.__ensure_current()
+        return self.__nodes, self.__x, self.__y
+
+    def get_index_of_nodes(self):
+        """
+        Returns a dictionary from id(node) to the index of the node in the list returned by get_positions.
+        It is built on first use after each rebuild.
+        """
+        self.__ensure_current()
+        if self.__index_of_node is None:
+            self.__index_of_node = {id(node): index for index, node in enumerate(self.__nodes)}
+        return self.__index_of_node
+
+    def find_node_indices_in_rectangle(self, left, top, right, bottom):
+        """
+        Returns the indices of all nodes inside the given rectangle. The indices refer to the nodes returned by
+        get_positions.
+
+        :param: left: The smallest x-coordinate of the rectangle.
+        :param: top: The smallest y-coordinate of the rectangle.
+        :param: right: The largest x-coordinate of the rectangle.
+        :param: bottom: The largest y-coordinate of the rectangle.
+        :return: Array of node indices.
+        """
+        self.__ensure_current()
+        if len(self.__nodes) == 0:
+            return np.zeros(0, dtype=np.intp)
+
+        first_column = max(int((left - self.__min_x) // self.__cell_size), 0)
+        last_column = min(int((right - self.__min_x) // self.__cell_size), self.__columns - 1)
+        first_row = max(int((top - self.__min_y) // self.__cell_size), 0)
+        last_row = min(int((bottom - self.__min_y) // self.__cell_size), self.__rows - 1)
+        if first_column > last_column or first_row > last_row:
+            return np.zeros(0, dtype=np.intp)
+
+        # The cells of a column between first_row and last_row have consecutive keys
+        column_keys = np.arange(first_column, last_column + 1, dtype=np.int64) * self.__rows
+        starts = np.searchsorted(self.__sorted_keys, column_keys + first_row, side='left')
+        ends = np.searchsorted(self.__sorted_keys, column_keys + last_row, side='right')
+        candidates = np.concatenate([self.__sorted_indices[start:end]
+                                     for start, end in zip(starts.tolist(), ends.tolist()) if end > start]
+                                    or [np.zeros(0, dtype=np.intp)])
+
+        inside = ((self.__x[candidates] >= left) & (self.__x[candidates] <= right)
+                  & (self.__y[candidates] >= top) & (self.__y[candidates] <= bottom))
+        return candidates[inside]
+
+    def __ensure_current(self):
+        """
+        Rebuilds the grid if the positions or the amount of nodes have changed since the last build.
+        """
+        version = (self.graph.position_version, len(self.graph.nodes))
+        if version != self.__built_version:
+            self.__build()
+            self.__built_version = version
+
+    def __build(self):
+        """
+        Reads the positions of all nodes and sorts them into the grid. The cells are chosen so that each cell
+        contains about one node if the nodes were distributed evenly.
+        """
+        self.__nodes = list(self.graph.nodes)
+        self.__index_of_node = None
+        node_count = len(self.__nodes)
+        indices = NodeStore.get_indices(self.__nodes)
+        self.__x = self.graph.node_store.read("x", indices)
+        self.__y = self.graph.node_store.read("y", indices)
+        if node_count == 0:
+            self.__sorted_keys = np.zeros(0, dtype=np.int64)
+            self.__sorted_indices = np.zeros(0, dtype=np.intp)
+            return
+
+        self.__min_x, self.__min_y = float(self.__x.min()), float(self.__y.min())
+        extent = max(float(self.__x.max()) - self.__min_x, float(self.__y.max()) - self.__min_y)
+        cells_per_axis = max(1, math.isqrt(node_count))
+        self.__cell_size = max(extent / cells_per_axis, self.MIN_CELL_SIZE)
+        self.__columns = int((float(self.__x.max()) - self.__min_x) // self.__cell_size) + 1
+        self.__rows = int((float(self.__y.max()) - self.__min_y) // self.__cell_size) + 1
+
+        columns = ((self.__x - self.__min_x) // self.__cell_size).astype(np.int64)
+        rows = ((self.__y - self.__min_y) // self.__cell_size).astype(np.int64)
+        keys = columns * self.__rows + rows
+        self.__sorted_indices = np.argsort(keys, kind='stable')
+        self.__sorted_keys = keys[self.__sorted_indices]
+
+    def __get_extent(self):
+        """
+        Returns the edge length of the grid.
+        """
+        return max(self.__columns, self.__rows) * self.__cell_size
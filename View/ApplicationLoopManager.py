@@ -11,13 +11,19 @@ class ApplicationLoopManager:
     a cohesive application experience, managing everything from rendering the graph to handling user interactions.
     """
 
-    def __init__(self, component_provider: IComponentProvider):
+    def __init__(self, component_provider: IComponentProvider, max_frames_per_second=60, event_driven=True):
         """
         Initializes the ApplicationLoopManager with the necessary components from the component provider.
 
         :param: component_provider: An instance of IComponentProvider that provides access to essential
         application components.
+        :param: max_frames_per_second: Upper limit of the frame rate.
+        :param: event_driven: If True, frames are only drawn if a component has marked the screen as dirty, and the
+        loop sleeps until the next event while the layout is paused and nothing is dirty. If False, every frame is
+        drawn.
         """
+        self.max_frames_per_second = max_frames_per_second
+        self.event_driven = event_driven
         self.screen = component_provider.get_screen()
         self.uiTheme = component_provider.get_ui_theme()
         self.node_details_window = component_provider.get_node_details_window()
@@ -29,6 +35,7 @@ class ApplicationLoopManager:
         self.graphLayoutHandler = component_provider.get_graph_layout_handler()
         self.graphVisualizer = component_provider.get_graph_visualizer()
         self.main_menu = component_provider.get_main_menu()
+        self.redraw_tracker = component_provider.get_redraw_tracker()
         self.run()
 
     def run(self):
@@ -41,15 +48,21 @@ class ApplicationLoopManager:
         start_screen_drag = None
         start_node_drag = None
         pause_layout = True
+        clock = pygame.time.Clock()
 
         while running:
-            # Hintergrund zeichnen
-            self.screen.fill(self.uiTheme.BACKGROUND_COLOR)
+            if self.event_driven and pause_layout and not self.redraw_tracker.is_dirty():
+                # Nothing changes on its own, so sleep until the next event
+                events = [pygame.event.wait()] + pygame.event.get()
+            else:
+                events = pygame.event.get()
 
-            for event in pygame.event.get():
+            for event in events:
                 # Mouse Down Events
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    self.redraw_tracker.mark_dirty()
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 3:  # Right Click
                         start_screen_drag = pygame.mouse.get_pos()
@@ -110,7 +123,10 @@ class ApplicationLoopManager:
                     dx = mouse_x - start_node_drag[0]
                     dy = mouse_y - start_node_drag[1]
                     start_node_drag = (mouse_x, mouse_y)
-                    self.subtree_mover.move_selected_node_subtree(self.selectedNodeContainer.selected_node, dx, dy)
+                    moved_nodes = self.subtree_mover.move_selected_node_subtree(
+                        self.selectedNodeContainer.selected_node, dx, dy)
+                    # Feed the drag back into the layout simulation
+                    self.graphLayoutHandler.nodes_moved(moved_nodes, dx, dy)
 
                 # Menü-Event-Handling
                 self.main_menu.handle_event(event)
@@ -118,17 +134,27 @@ class ApplicationLoopManager:
             # Start Auto Layout
             # self.graph_layout_handler.auto_layout(pause_layout, 0.05, 100)
             self.graphLayoutHandler.auto_layout(pause_layout)
+            self.graphVisualizer.check_for_changes()
 
-            self.graphVisualizer.draw_graph()
-            # Zeichne das Menü
-            self.main_menu.draw(self.screen)
+            if not self.event_driven or self.redraw_tracker.is_dirty():
+                # Hintergrund zeichnen
+                self.screen.fill(self.uiTheme.BACKGROUND_COLOR)
 
-            # Show Details of selected Node
-            if self.selectedNodeContainer.selected_node is not None:
-                self.node_details_window.show_node_details()
+                self.graphVisualizer.draw_graph()
+                # Zeichne das Menü
+                self.main_menu.draw(self.screen)
 
-            # Zeichne Barnes Hut Areas
-            # self.graph_layout_handler.show_barnes_hut_area()
+                # Show Details of selected Node
+                if self.selectedNodeContainer.selected_node is not None:
+                    self.node_details_window.show_node_details()
 
-            # Aktualisiere das Display
-            pygame.display.flip()
+                # Zeichne Barnes Hut Areas
+                # self.graph_layout_handler.show_barnes_hut_area()
+
+                # Aktualisiere das Display
+                self.redraw_tracker.update_display()
+
+            clock.tick(self.max_frames_per_second)
+
+        # Stop the background layout simulation
+        self.graphLayoutHandler.shutdown()
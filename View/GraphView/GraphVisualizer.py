@@ -1,10 +1,11 @@
-from collections import deque
-
+import numpy as np
 import pygame
 
 from GraphModel import Node, Graph, SelectedNodeContainer
+from GraphModel.SpatialIndex import SpatialIndex
 from View.GraphView import IScaleOffsetTransformer
 from View.GraphView.IGraphVisualizer import IGraphVisualizer
+from View.RedrawTracker import RedrawTracker
 
 
 class GraphVisualizer(IGraphVisualizer):
@@ -21,12 +22,26 @@ class GraphVisualizer(IGraphVisualizer):
     node_color = (0, 0, 0)
     selected_node_color = (0, 0, 0)
     selected_node_subtree_color = (0, 0, 0)
+    highlight_max_hops = None
     BASE_NODE_DIAMETER = 5
     BASE_NODE_HIGHLIGHT_DIAMETER = 8
+    # Level of detail: edge length of a density tile in pixels
+    LOD_TILE_SIZE = 8
+    # Edges are aggregated on coarser tiles, since long edges connect many distinct pairs of small tiles
+    LOD_EDGE_TILE_SIZE = 32
+    # Level of detail is used if at least this many nodes are visible ...
+    LOD_MIN_VISIBLE_NODES = 1000
+    # ... and they share a density tile with this many other nodes on average
+    LOD_MIN_NODES_PER_TILE = 2
+    # The cached graph layer extends this many pixels beyond each side of the screen, so panning within this
+    # distance only moves the layer instead of drawing the graph again
+    LAYER_MARGIN = 256
 
     def __init__(self, scale_offset_transformer: IScaleOffsetTransformer,
                  screen, graph: Graph, selected_node_container: SelectedNodeContainer,
-                 edge_color, node_color, selected_node_color, selected_node_subtree_color):
+                 edge_color, node_color, selected_node_color, selected_node_subtree_color,
+                 spatial_index: SpatialIndex = None, background_color=(255, 255, 255),
+                 redraw_tracker: RedrawTracker = None, highlight_max_hops=None):
         """
         Initializes the GraphVisualizer with necessary components and visual properties.
 
@@ -38,6 +53,11 @@ class GraphVisualizer(IGraphVisualizer):
         :param: node_color: The color to be used for drawing nodes.
         :param: selected_node_color: The color to be used for highlighting the selected node.
         :param: selected_node_subtree_color: The color to be used for highlighting the subtree of the selected node.
+        :param: spatial_index: The SpatialIndex of the graph, used to find the visible nodes.
+        :param: background_color: The color behind the graph, used to clear the cached graph layer.
+        :param: redraw_tracker: The RedrawTracker that is informed when the graph needs to be drawn again.
+        :param: highlight_max_hops: The largest distance in connections from the selected node up to which nodes are
+        highlighted, or None to highlight the whole subtree.
         """
 
         self.scaleOffsetTransformer = scale_offset_transformer
@@ -49,62 +69,296 @@ class GraphVisualizer(IGraphVisualizer):
         self.node_color = node_color
         self.selected_node_color = selected_node_color
         self.selected_node_subtree_color = selected_node_subtree_color
+        self.background_color = background_color
+        self.highlight_max_hops = highlight_max_hops
+
+        self.spatial_index = spatial_index if spatial_index is not None else SpatialIndex(graph)
+        self.redraw_tracker = redraw_tracker if redraw_tracker is not None else RedrawTracker()
+        # Positions, zoom, offset and selection of the last check_for_changes
+        self.__view_state = None
+        self.__view_selected_node = None
+        # Highlighted nodes and edges and the selection, topology and hop limit they were found with
+        self.__subtree_key = None
+        self.__subtree = None
+
+        # Surface the graph is drawn on and the shift of its coordinates relative to the screen
+        self.__target = screen
+        self.__target_shift = 0
+        # Cached graph layer and the positions, zoom, selection, topology and offset it was drawn with
+        self.__layer = None
+        self.__layer_state = None
+        self.__layer_offset = (0, 0)
 
     def draw_graph(self):
         """
         Renders the graph on the screen, drawing both nodes and edges.
         This method also handles the highlighting of the selected node and its subtree if applicable.
+
+        The graph is drawn on an offscreen layer that is larger than the screen and reused as long as the positions,
+        the zoom, the selection and the connections stay the same. If only the offset has changed, e.g. by panning, the
+        layer is blitted with the difference, as long as it still covers the screen.
+        """
+        nodes, x, y = self.spatial_index.get_positions()
+        layer_state = (x, self.scaleOffsetTransformer.zoom, self.selectedNodeContainer.selected_node,
+                       self.screen.get_size(), self.graph.get_topology_version())
+        dx = round(self.scaleOffsetTransformer.offset_x - self.__layer_offset[0])
+        dy = round(self.scaleOffsetTransformer.offset_y - self.__layer_offset[1])
+
+        if (not self.__is_layer_state_current(layer_state)
+                or abs(dx) > self.LAYER_MARGIN or abs(dy) > self.LAYER_MARGIN):
+            self.__render_layer(layer_state)
+            dx, dy = 0, 0
+        self.screen.blit(self.__layer, (dx - self.LAYER_MARGIN, dy - self.LAYER_MARGIN))
+
+    def check_for_changes(self):
+        """
+        Marks the screen as dirty if the positions of the nodes, their connections, the zoom, the offset or the
+        selection have changed since the last check.
         """
+        view_state = (self.graph.position_version, self.graph.get_topology_version(), self.scaleOffsetTransformer.zoom,
+                      self.scaleOffsetTransformer.offset_x, self.scaleOffsetTransformer.offset_y)
+        selected_node = self.selectedNodeContainer.selected_node
+        if view_state != self.__view_state or selected_node is not self.__view_selected_node:
+            self.__view_state = view_state
+            self.__view_selected_node = selected_node
+            self.redraw_tracker.mark_dirty()
+
+    def __is_layer_state_current(self, layer_state):
+        """
+        Checks whether the cached layer was drawn with the given positions, zoom, selection, screen size and topology.
+        """
+        if self.__layer_state is None:
+            return False
+        x, zoom, selected_node, screen_size, topology_version = self.__layer_state
+        return (x is layer_state[0] and zoom == layer_state[1] and selected_node is layer_state[2]
+                and screen_size == layer_state[3] and topology_version == layer_state[4])
+
+    def __render_layer(self, layer_state):
+        """
+        Draws the graph on the cached layer with the current offset.
+        """
+        width, height = self.screen.get_size()
+        layer_size = (width + 2 * self.LAYER_MARGIN, height + 2 * self.LAYER_MARGIN)
+        if self.__layer is None or self.__layer.get_size() != layer_size:
+            # Same pixel format as the screen, so blitting the layer does not need a conversion
+            self.__layer = pygame.Surface(layer_size, 0, self.screen)
+        self.__layer.fill(self.background_color)
+
+        self.__target = self.__layer
+        self.__target_shift = self.LAYER_MARGIN
+        try:
+            self.__draw_graph_on_target()
+        finally:
+            self.__target = self.screen
+            self.__target_shift = 0
+        self.__layer_state = layer_state
+        self.__layer_offset = (self.scaleOffsetTransformer.offset_x, self.scaleOffsetTransformer.offset_y)
+
+    def __draw_graph_on_target(self):
+        """
+        Draws the nodes and edges on the current target surface.
+
+        Only nodes inside the area covered by the target and edges crossing it are drawn. If so many nodes are visible
+        that they overlap on the screen, they are aggregated into density tiles and the edges into connections between
+        tiles.
+        """
+        nodes, x, y = self.spatial_index.get_positions()
+        left, top, right, bottom = self.__get_target_area()
+        margin = self.BASE_NODE_HIGHLIGHT_DIAMETER / self.scaleOffsetTransformer.zoom
+        visible_nodes = self.spatial_index.find_node_indices_in_rectangle(left - margin, top - margin,
+                                                                          right + margin, bottom + margin)
+        edges = self.__get_visible_edges(nodes, x, y, left, top, right, bottom)
+        screen_x, screen_y = self.__get_target_positions(x, y)
+
+        tiles = None
+        if len(visible_nodes) >= self.LOD_MIN_VISIBLE_NODES:
+            # Occupied density tiles and the amount of nodes in each of them
+            tiles, node_counts = np.unique(self.__get_tile_keys(screen_x[visible_nodes], screen_y[visible_nodes],
+                                                                self.LOD_TILE_SIZE), return_counts=True)
+            if len(visible_nodes) < self.LOD_MIN_NODES_PER_TILE * len(tiles):
+                tiles = None
+
+        if tiles is not None:
+            self.__draw_edge_tiles(screen_x, screen_y, edges)
+            self.__draw_node_tiles(tiles, node_counts)
+            if self.selectedNodeContainer.selected_node is not None:
+                self.highlight_selected_subtree(self.selectedNodeContainer.selected_node)
+            return
+
         # Zeichne Kanten
-        for node in self.graph.nodes:
-            for connected_node in node.get_connected_nodes().values():
-                scaled_start = self.scaleOffsetTransformer.get_scaled_coordinates(node)
-                scaled_end = self.scaleOffsetTransformer.get_scaled_coordinates(connected_node)
-                pygame.draw.line(self.screen, self.edge_color, scaled_start, scaled_end)
+        for start_x, start_y, end_x, end_y in zip(screen_x[edges[:, 0]].tolist(), screen_y[edges[:, 0]].tolist(),
+                                                  screen_x[edges[:, 1]].tolist(), screen_y[edges[:, 1]].tolist()):
+            pygame.draw.line(self.__target, self.edge_color, (start_x, start_y), (end_x, end_y))
 
         if self.selectedNodeContainer.selected_node is not None:
             self.highlight_selected_subtree(self.selectedNodeContainer.selected_node)
 
         # Zeichne Knoten
-        for node in self.graph.nodes:
-            scaled_x, scaled_y = self.scaleOffsetTransformer.get_scaled_coordinates(node)
-            pygame.draw.circle(self.screen, self.node_color, (scaled_x, scaled_y), self.BASE_NODE_DIAMETER)
+        for scaled_x, scaled_y in zip(screen_x[visible_nodes].tolist(), screen_y[visible_nodes].tolist()):
+            pygame.draw.circle(self.__target, self.node_color, (scaled_x, scaled_y), self.BASE_NODE_DIAMETER)
+
+    def __get_target_area(self):
+        """
+        Returns the area of the graph covered by the current target surface as (left, top, right, bottom).
+        """
+        left, top, right, bottom = self.scaleOffsetTransformer.get_visible_area()
+        shift = self.__target_shift / self.scaleOffsetTransformer.zoom
+        return left - shift, top - shift, right + shift, bottom + shift
+
+    def __get_target_positions(self, x, y):
+        """
+        Returns the coordinates of the nodes on the current target surface.
+        """
+        screen_x, screen_y = self.scaleOffsetTransformer.get_scaled_positions(x, y)
+        if self.__target_shift == 0:
+            return screen_x, screen_y
+        return screen_x + self.__target_shift, screen_y + self.__target_shift
+
+    def __get_visible_edges(self, nodes, x, y, left, top, right, bottom):
+        """
+        Returns the edges whose bounding box intersects the visible area.
+
+        :return: Array of shape (m, 2) with the (source, target) node indices of the edges.
+        """
+        adjacency = self.__get_adjacency(nodes)
+        if adjacency is None:
+            return np.zeros((0, 2), dtype=np.intp)
+        edges = adjacency.edges
+        return edges[self.__intersects_area(x, y, edges, left, top, right, bottom)]
+
+    def __get_adjacency(self, nodes):
+        """
+        Returns the Adjacency of the graph, which is shared with the other users of the graph and only rebuilt when
+        the topology has changed, or None if the indexed nodes are not the current nodes of the graph.
+        """
+        adjacency = self.graph.get_adjacency()
+        # The indices of the Adjacency refer to the list of nodes of the graph, the indexed nodes are a copy of it
+        if adjacency.node_count != len(nodes):
+            return None
+        return adjacency
+
+    @staticmethod
+    def __intersects_area(x, y, edges, left, top, right, bottom):
+        """
+        Returns a mask of the edges whose bounding box intersects the given area.
+        """
+        start_x, start_y = x[edges[:, 0]], y[edges[:, 0]]
+        end_x, end_y = x[edges[:, 1]], y[edges[:, 1]]
+        return ((np.minimum(start_x, end_x) <= right) & (np.maximum(start_x, end_x) >= left)
+                & (np.minimum(start_y, end_y) <= bottom) & (np.maximum(start_y, end_y) >= top))
+
+    @staticmethod
+    def __get_tile_keys(screen_x, screen_y, tile_size):
+        """
+        Returns a key per screen position that identifies the tile it lies in. Keys can be decoded with
+        __decode_tile_keys.
+        """
+        return (screen_x // tile_size) * (1 << 32) + (screen_y // tile_size + (1 << 31))
+
+    @staticmethod
+    def __decode_tile_keys(tile_keys, tile_size):
+        """
+        Returns the screen coordinates of the upper left corners of the tiles with the given keys.
+        """
+        return (tile_keys >> 32) * tile_size, ((tile_keys & 0xFFFFFFFF) - (1 << 31)) * tile_size
+
+    def __draw_node_tiles(self, tile_keys, node_counts):
+        """
+        Draws one square per density tile, closer to the node color the more nodes it contains.
+
+        :param: tile_keys: The keys of the occupied tiles.
+        :param: node_counts: The amount of nodes in each tile.
+        """
+        # Logarithmic, so that single nodes remain visible next to dense clusters
+        intensity = np.log1p(node_counts) / np.log1p(node_counts.max())
+        colors = (np.array(self.edge_color)[np.newaxis, :]
+                  + (np.array(self.node_color) - np.array(self.edge_color))[np.newaxis, :] * intensity[:, np.newaxis])
+        tile_x, tile_y = self.__decode_tile_keys(tile_keys, self.LOD_TILE_SIZE)
+        for left, top, color in zip(tile_x.tolist(), tile_y.tolist(), colors.astype(int).tolist()):
+            pygame.draw.rect(self.__target, color, (left, top, self.LOD_TILE_SIZE, self.LOD_TILE_SIZE))
+
+    def __draw_edge_tiles(self, screen_x, screen_y, edges):
+        """
+        Draws one line between the centers of each pair of edge tiles connected by at least one edge.
+
+        :param: screen_x: The screen x-coordinate of every node.
+        :param: screen_y: The screen y-coordinate of every node.
+        :param: edges: Array of shape (m, 2) with the visible edges.
+        """
+        if len(edges) == 0:
+            return
+        tile_keys, endpoint_tiles = np.unique(self.__get_tile_keys(screen_x[edges], screen_y[edges],
+                                                                   self.LOD_EDGE_TILE_SIZE), return_inverse=True)
+        endpoint_tiles = endpoint_tiles.reshape(-1, 2)
+        endpoint_tiles = endpoint_tiles[endpoint_tiles[:, 0] != endpoint_tiles[:, 1]]
+        tile_pairs = np.unique(endpoint_tiles[:, 0] * len(tile_keys) + endpoint_tiles[:, 1])
+
+        tile_x, tile_y = self.__decode_tile_keys(tile_keys, self.LOD_EDGE_TILE_SIZE)
+        tile_x += self.LOD_EDGE_TILE_SIZE // 2
+        tile_y += self.LOD_EDGE_TILE_SIZE // 2
+        starts, ends = tile_pairs // len(tile_keys), tile_pairs % len(tile_keys)
+        for start_x, start_y, end_x, end_y in zip(tile_x[starts].tolist(), tile_y[starts].tolist(),
+                                                  tile_x[ends].tolist(), tile_y[ends].tolist()):
+            pygame.draw.line(self.__target, self.edge_color, (start_x, start_y), (end_x, end_y))
 
     def highlight_selected_subtree(self, node: Node):
         """
         Highlights the subtree rooted at a specified node. This method visually differentiates
         the selected node and its connected nodes from the rest of the graph.
 
+        The reached nodes and the connections between them are cached until the selection or the topology changes,
+        so only their screen coordinates are computed per drawing. If highlight_max_hops is set, only the nodes
+        within this many connections of the selected node are highlighted.
+
         :param: node: The root node of the subtree to be highlighted.
         """
         if node is None:
             return
 
-        stack = deque()
-        stack.append(node)
-
-        visited_nodes = set()
-
-        while stack:
-            current_node = stack.pop()
-            scaled_start = self.scaleOffsetTransformer.get_scaled_coordinates(current_node)
-            pygame.draw.circle(self.screen, self.selected_node_color, scaled_start, self.BASE_NODE_HIGHLIGHT_DIAMETER)
-
-            visited_nodes.add(current_node)
+        nodes, x, y = self.spatial_index.get_positions()
+        subtree = self.__get_highlighted_subtree(node, nodes)
+        if subtree is None:
+            return
+        subtree_nodes, subtree_edges = subtree
 
-            for connected_node in current_node.get_connected_nodes().values():
-                scaled_end = self.scaleOffsetTransformer.get_scaled_coordinates(connected_node)
-                pygame.draw.line(self.screen, self.selected_node_subtree_color, scaled_start, scaled_end)
+        left, top, right, bottom = self.__get_target_area()
+        margin = self.BASE_NODE_HIGHLIGHT_DIAMETER / self.scaleOffsetTransformer.zoom
+        subtree_edges = subtree_edges[self.__intersects_area(x, y, subtree_edges, left, top, right, bottom)]
+        node_x, node_y = x[subtree_nodes], y[subtree_nodes]
+        subtree_nodes = subtree_nodes[(node_x >= left - margin) & (node_x <= right + margin)
+                                      & (node_y >= top - margin) & (node_y <= bottom + margin)]
 
-                if connected_node not in visited_nodes:
-                    stack.append(connected_node)
+        screen_x, screen_y = self.__get_target_positions(x, y)
+        for start_x, start_y, end_x, end_y in zip(screen_x[subtree_edges[:, 0]].tolist(),
+                                                  screen_y[subtree_edges[:, 0]].tolist(),
+                                                  screen_x[subtree_edges[:, 1]].tolist(),
+                                                  screen_y[subtree_edges[:, 1]].tolist()):
+            pygame.draw.line(self.__target, self.selected_node_subtree_color, (start_x, start_y), (end_x, end_y))
+        for scaled_x, scaled_y in zip(screen_x[subtree_nodes].tolist(), screen_y[subtree_nodes].tolist()):
+            pygame.draw.circle(self.__target, self.selected_node_color, (scaled_x, scaled_y),
+                               self.BASE_NODE_HIGHLIGHT_DIAMETER)
 
+    def __get_highlighted_subtree(self, node, nodes):
         """
-        for connected_node in node.get_connected_nodes().values():
-            scaled_start = self.scale_offset_transformer.get_scaled_coordinates(node)
-            scaled_end = self.scale_offset_transformer.get_scaled_coordinates(connected_node)
-            pygame.draw.line(self.screen, self.selected_node_subtree_color, scaled_start, scaled_end)
-            self.highlight_selected_subtree(connected_node)
-        scaled_x, scaled_y = self.scale_offset_transformer.get_scaled_coordinates(node)
-        pygame.draw.circle(self.screen, self.selected_node_color, (scaled_x, scaled_y), 8)
+        Returns the indices of the nodes reachable from the given node within highlight_max_hops connections and
+        the connections between them, or None if the node is not part of the graph.
+
+        :return: Tuple of an array with the node indices and an array of shape (m, 2) with the edges.
         """
+        key = (node, self.graph.get_topology_version(), self.highlight_max_hops)
+        if self.__subtree_key is not None and key[0] is self.__subtree_key[0] and key[1:] == self.__subtree_key[1:]:
+            return self.__subtree
+
+        index = self.spatial_index.get_index_of_nodes().get(id(node))
+        adjacency = self.__get_adjacency(nodes)
+        if index is None or adjacency is None:
+            subtree = None
+        else:
+            subtree_nodes = np.concatenate(adjacency.get_bfs_layers(index, self.highlight_max_hops))
+            in_subtree = np.zeros(adjacency.node_count, dtype=bool)
+            in_subtree[subtree_nodes] = True
+            edges = adjacency.edges
+            subtree = subtree_nodes, edges[in_subtree[edges[:, 0]] & in_subtree[edges[:, 1]]]
+        self.__subtree_key = key
+        self.__subtree = subtree
+        return subtree
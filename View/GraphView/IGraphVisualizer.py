@@ -10,6 +10,12 @@ class IGraphVisualizer(ABC):
         Draws the entire graph on the Pygame screen, including edges and nodes.
         """
 
+    @abstractmethod
+    def check_for_changes(self):
+        """
+        Marks the screen as dirty if the graph or the view on it has changed since the last check.
+        """
+
     @abstractmethod
     def highlight_selected_subtree(self, node: Node):
         """
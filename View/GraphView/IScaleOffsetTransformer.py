@@ -12,6 +12,36 @@ class IScaleOffsetTransformer(ABC):
         :return: Tuple[int, int]: The transformed (scaled) x and total_height coordinates of the node.
         """
 
+    @abstractmethod
+    def get_scaled_coordinate_arrays(self, x, y):
+        """
+        Transforms arrays of coordinates based on the current zoom and offset at once.
+
+        :param: x (ndarray): The x-coordinates to transform.
+        :param: y (ndarray): The total_height-coordinates to transform.
+
+        :return: Tuple[ndarray, ndarray]: The transformed (scaled) x and total_height coordinates as integer arrays.
+        """
+
+    @abstractmethod
+    def get_scaled_positions(self, x, y):
+        """
+        Transforms the position arrays of all nodes, reusing the result until zoom, offset or the arrays change.
+
+        :param: x (ndarray): The x-coordinates of the nodes.
+        :param: y (ndarray): The total_height-coordinates of the nodes.
+
+        :return: Tuple[ndarray, ndarray]: The transformed (scaled) x and total_height coordinates as integer arrays.
+        """
+
+    @abstractmethod
+    def get_visible_area(self):
+        """
+        Returns the rectangle of the graph plane that is visible in the window.
+
+        :return: Tuple[float, float, float, float]: The left, top, right and bottom coordinates of the visible area.
+        """
+
     @abstractmethod
     def get_scaled_mouse_position(self):
         """
@@ -1,3 +1,4 @@
+import numpy as np
 import pygame
 
 from View.GraphView.IScaleOffsetTransformer import IScaleOffsetTransformer
@@ -30,6 +31,10 @@ class ScaleOffsetTransformer(IScaleOffsetTransformer):
 
         The offset is initialized to center the camera focus in the window.
         """
+        self.window_width, self.window_height = window_width, window_height
+        # Arrays last passed to get_scaled_positions, the zoom and offset they were transformed with and the result
+        self.__scaled_positions_source = None
+        self.__scaled_positions = None
         # Offset wird auf Start position initalisiert
         self.offset_x, self.offset_y = window_width // 2 - self.start_x, window_height // 2 - self.start_y
 
@@ -45,6 +50,49 @@ class ScaleOffsetTransformer(IScaleOffsetTransformer):
         scaled_y = int(node.y * self.zoom) + self.offset_y
         return scaled_x, scaled_y
 
+    def get_scaled_coordinate_arrays(self, x, y):
+        """
+        Transforms arrays of coordinates based on the current zoom and offset at once.
+
+        :param: x (ndarray): The x-coordinates to transform.
+        :param: y (ndarray): The total_height-coordinates to transform.
+
+        :return: Tuple[ndarray, ndarray]: The transformed (scaled) x and total_height coordinates as integer arrays.
+        """
+        scaled_x = (np.trunc(np.asarray(x) * self.zoom) + self.offset_x).astype(np.int64)
+        scaled_y = (np.trunc(np.asarray(y) * self.zoom) + self.offset_y).astype(np.int64)
+        return scaled_x, scaled_y
+
+    def get_scaled_positions(self, x, y):
+        """
+        Transforms the position arrays of all nodes like get_scaled_coordinate_arrays. The result is reused until
+        zoom, offset or the arrays change, so it is calculated at most once per frame no matter how many components
+        need it. The arrays must be replaced instead of being modified in place when positions change, as the
+        SpatialIndex does.
+
+        :param: x (ndarray): The x-coordinates of the nodes.
+        :param: y (ndarray): The total_height-coordinates of the nodes.
+
+        :return: Tuple[ndarray, ndarray]: The transformed (scaled) x and total_height coordinates as integer arrays.
+        """
+        source = (x, y, self.zoom, self.offset_x, self.offset_y)
+        cached_source = self.__scaled_positions_source
+        if (cached_source is None or cached_source[0] is not x or cached_source[1] is not y
+                or cached_source[2:] != source[2:]):
+            self.__scaled_positions = self.get_scaled_coordinate_arrays(x, y)
+            self.__scaled_positions_source = source
+        return self.__scaled_positions
+
+    def get_visible_area(self):
+        """
+        Returns the rectangle of the graph plane that is visible in the window.
+
+        :return: Tuple[float, float, float, float]: The left, top, right and bottom coordinates of the visible area.
+        """
+        left = -self.offset_x / self.zoom
+        top = -self.offset_y / self.zoom
+        return left, top, left + self.window_width / self.zoom, top + self.window_height / self.zoom
+
     def get_scaled_mouse_position(self):
         """
         Returns the mouse position on the scaled plane.
@@ -0,0 +1,44 @@
+import pygame
+
+
+class RedrawTracker:
+    """
+    The RedrawTracker collects the requests of components to repaint the screen. Components mark themselves as dirty
+    when their visual state changes, either with the screen region they occupy or as a whole. The application loop
+    only draws a frame if something is dirty and then only pushes the dirty regions to the display.
+    """
+
+    def __init__(self):
+        """
+        Initializes the RedrawTracker. The first frame is always drawn.
+        """
+        self.__full_redraw = True
+        self.__dirty_regions = []
+
+    def mark_dirty(self, region=None):
+        """
+        Requests a repaint.
+
+        :param: region: The pygame.Rect of the screen that has changed, or None if the whole screen has changed.
+        """
+        if region is None:
+            self.__full_redraw = True
+        elif not self.__full_redraw:
+            self.__dirty_regions.append(pygame.Rect(region))
+
+    def is_dirty(self):
+        """
+        Returns True if a repaint has been requested since the last frame.
+        """
+        return self.__full_redraw or len(self.__dirty_regions) > 0
+
+    def update_display(self):
+        """
+        Pushes the dirty regions of the drawn frame to the display and clears all requests.
+        """
+        if self.__full_redraw:
+            pygame.display.flip()
+        elif self.__dirty_regions:
+            pygame.display.update(self.__dirty_regions)
+        self.__full_redraw = False
+        self.__dirty_regions = []
@@ -1,12 +1,23 @@
 import os
 
+import pygame
+
 from View.UI.FontManager.IFontManger import IFontManager
 
 
 class FontManager(IFontManager):
     """
     This class manages fonts and provides paths to various CharisSIL fonts.
+
+    It also is the pool of the Font objects of the application. A font is loaded on the first request for its face,
+    size and style and afterwards shared by all components, no matter which FontManager instance they use.
     """
+    # Face of the CharisSIL fonts, other faces are looked up as system fonts. None is the default font of pygame.
+    FACE_CHARIS_SIL = "CharisSIL"
+
+    # Loaded fonts by (face, size, bold, italic), shared process-wide
+    __font_pool = {}
+
     font_path_charisSIL_Bold = None
     font_path_charisSIL_BoldItalic = None
     font_path_charisSIL_Italic = None
@@ -57,3 +68,38 @@ class FontManager(IFontManager):
             str: File path to the CharisSIL Regular font.
         """
         return self.font_path_charisSIL_Regular
+
+    def get_font(self, face, size, bold=False, italic=False):
+        """
+        Returns the font with the given face, size and style from the pool, loading it on the first request.
+
+        Args:
+            face (str): FontManager.FACE_CHARIS_SIL, the name of a system font, or None for the default font.
+            size (int): The size of the font.
+            bold (bool): True for a bold font.
+            italic (bool): True for an italic font.
+
+        Returns:
+            pygame.font.Font: The shared font. Its style must not be changed.
+        """
+        key = (face, size, bold, italic)
+        font = self.__font_pool.get(key)
+        if font is None:
+            # The font module is initialized with the first font, not when the application is imported
+            if not pygame.font.get_init():
+                pygame.font.init()
+            if face == self.FACE_CHARIS_SIL:
+                font = pygame.font.Font(self.__get_charissil_font_path(bold, italic), size)
+            else:
+                font = pygame.font.SysFont(face, size, bold, italic)
+            self.__font_pool[key] = font
+        return font
+
+    def __get_charissil_font_path(self, bold, italic):
+        if bold and italic:
+            return self.font_path_charisSIL_BoldItalic
+        if bold:
+            return self.font_path_charisSIL_Bold
+        if italic:
+            return self.font_path_charisSIL_Italic
+        return self.font_path_charisSIL_Regular
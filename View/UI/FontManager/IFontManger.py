@@ -18,6 +18,6 @@ class IFontManager(ABC):
     def get_font_path_font_path_charissil_regular(self):
         pass
 
-
-
-
+    @abstractmethod
+    def get_font(self, face, size, bold=False, italic=False):
+        pass
@@ -4,6 +4,7 @@ import pygame
 
 from GraphController.GraphExporter import GraphExporter
 from GraphController.GraphImporter import GraphImporter
+from View.RedrawTracker import RedrawTracker
 from View.UI.MainMenu.MenuItemButton import MenuButton
 from View.UI.Label import Label
 from View.UI.UIThemes import UITheme
@@ -18,7 +19,7 @@ class MainMenu:
     """
 
     def __init__(self, window_width, window_height, menu_x, menu_y, spacing, ui_theme: UITheme, resources_folder_path,
-                 graph_exporter: GraphExporter, graph_importer: GraphImporter):
+                 graph_exporter: GraphExporter, graph_importer: GraphImporter, redraw_tracker: RedrawTracker = None):
         """
         Initializes the MainMenu with necessary components, settings, and dimensions.
 
@@ -31,6 +32,7 @@ class MainMenu:
         :param: resources_folder_path: The path to the folder containing resources like icons.
         :param: graph_exporter: The GraphExporter instance used for exporting graph data.
         :param: graph_importer: The GraphImporter instance used for importing graph data.
+        :param: redraw_tracker: The RedrawTracker that is informed when the menu needs to be drawn again.
         """
         # Import Export
         self.graph_exporter = graph_exporter
@@ -84,6 +86,14 @@ class MainMenu:
                                         Label.IMPORT_BUTTON)
         self.show_menu = False
 
+        self.redraw_tracker = redraw_tracker if redraw_tracker is not None else RedrawTracker()
+        self.menu_region = pygame.Rect(self.menu_x, self.menu_y, menu_background_width, menu_background_height)
+
+        # Surfaces of the menu in drawing order, collected again only when the state of the menu or the surfaces of
+        # its buttons have changed
+        self.blit_sequence = []
+        self.blit_sequence_state = None
+
     def handle_event(self, event):
         """
         Handles user interaction events with the menu, including clicks for expanding the menu,
@@ -93,14 +103,17 @@ class MainMenu:
         """
         if self.menu_button.click(event):
             self.show_menu = not self.show_menu
+            self.redraw_tracker.mark_dirty(self.menu_region)
 
         if self.show_menu:
             self.menu_button.maximized = True
             if self.export_button.click(event):
                 self.export_action()
+                self.redraw_tracker.mark_dirty(self.menu_region)
 
             if self.import_button.click(event):
                 self.import_action()
+                self.redraw_tracker.mark_dirty(self.menu_region)
         else:
             self.menu_button.maximized = False
 
@@ -110,13 +123,18 @@ class MainMenu:
 
         :param: screen: The Pygame screen object where the menu is rendered.
         """
-        if self.show_menu:
-            self.menu_button.draw(screen, True)
-            screen.blit(self.menu_background_surface, (self.menu_x, self.menu_y))
-            self.export_button.draw(screen)
-            self.import_button.draw(screen)
-        else:
-            self.menu_button.draw(screen)
+        state = (self.show_menu, self.menu_button.maximized, self.menu_button.render_version,
+                 self.export_button.render_version, self.import_button.render_version)
+        if state != self.blit_sequence_state:
+            if self.show_menu:
+                self.blit_sequence = (self.menu_button.get_blit_sequence(True)
+                                      + [(self.menu_background_surface, (self.menu_x, self.menu_y))]
+                                      + self.export_button.get_blit_sequence()
+                                      + self.import_button.get_blit_sequence())
+            else:
+                self.blit_sequence = self.menu_button.get_blit_sequence()
+            self.blit_sequence_state = state
+        screen.blits(self.blit_sequence, doreturn=False)
 
     def export_action(self):
         """
@@ -1,5 +1,9 @@
 import pygame
 
+from View.UI.FontManager.FontManager import FontManager
+from View.UI.FontManager.IFontManger import IFontManager
+from View.UI.TextSurfaceCache import TextSurfaceCache
+
 
 class MenuButton:
     """
@@ -11,6 +15,10 @@ class MenuButton:
 
     maximized = True
 
+    font_manager: IFontManager
+    font_manager = FontManager()
+    LABEL_FONT_SIZE = 25
+
     def __init__(self, x, y, width, height, icon, icon_x_offset, parent_surface, label_color, background_color,
                  highlight_color, text=''):
         """
@@ -47,9 +55,51 @@ class MenuButton:
         self.label_area_width = self.width * 0.618
 
         self.icon = pygame.transform.scale(icon, (self.icon_size, self.icon_size))  # Skalieren des Icons
+        self.icon_position = (self.x + (self.icon_area_width // 2) - self.icon_size + self.icon_offset, self.y)
+
         self.button_background_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
         self.button_background_surface.fill(self.background_color)
 
+        # Incremented whenever the surfaces are rendered again, so cached blit sequences can be renewed
+        self.render_version = 0
+        self.__render_labels()
+
+    def set_colors(self, label_color, background_color, highlight_color):
+        """
+        Changes the colors of the button, e.g. after a change of the UI theme, and renders the labels again.
+
+        :param: label_color: The color of the label text.
+        :param: background_color: The background color of the button.
+        :param: highlight_color: The color used to highlight the button when selected.
+        """
+        self.label_color = label_color
+        self.background_color = background_color
+        self.highlight_color = highlight_color
+        self.button_background_surface.fill(self.background_color)
+        self.__render_labels()
+
+    def __render_labels(self):
+        """
+        Renders the label for the normal and the highlighted state once, so drawing the button only blits surfaces.
+        """
+        self.render_version += 1
+        self.label_surface = None
+        self.highlighted_label_surface = None
+        self.label_position = None
+        if self.text == '':
+            return
+
+        font = self.font_manager.get_font(None, self.LABEL_FONT_SIZE)
+        text_surface_cache = TextSurfaceCache.get_shared_cache()
+        self.label_surface = text_surface_cache.render(font, self.text, True, self.label_color)
+        self.highlighted_label_surface = text_surface_cache.render(font, self.text, True, self.highlight_color)
+
+        # Label position
+        text_x = self.x + self.icon_area_width
+        # text_x = self.x + self.icon_size + (self.width - self.icon_size - text_surface.get_width()) // 2  # center
+        text_y = self.y + (self.height - self.label_surface.get_height()) // 2
+        self.label_position = (text_x, text_y)
+
     def draw(self, screen, is_selected: bool = False):
         """
         Draws the button on the given screen. This method handles the rendering of the button's icon, label,
@@ -58,31 +108,23 @@ class MenuButton:
         :param: screen: The Pygame screen object where the button will be drawn.
         :param: is_selected: A boolean indicating whether the button is currently selected.
         """
-        # Zeichne das Surface
-        screen.blit(self.button_background_surface, (self.x, self.y))
-
-        # Zeichne das Icon
-        screen.blit(self.icon, (
-            self.x + (self.icon_area_width // 2) - self.icon_size + self.icon_offset,
-            self.y))  # Das Icon wird links auf dem Button platziert
-
-        # Zeichne den Text, wenn vorhanden
-        if self.text != '' and self.maximized:
-            self.button_background_surface.fill(self.background_color)
-            font = pygame.font.SysFont(None, 25)
-            if is_selected:
-                text_surface = font.render(self.text, True, self.highlight_color)
-            else:
-                text_surface = font.render(self.text, True, self.label_color)
-
-            # Label position
-            text_x = self.x + self.icon_area_width
-            # text_x = self.x + self.icon_size + (self.width - self.icon_size - text_surface.get_width()) // 2  # center
-            text_y = self.y + (self.height - text_surface.get_height()) // 2
-
-            screen.blit(text_surface, (text_x, text_y))
-        else:
-            self.button_background_surface.fill((0, 0, 0, 0))
+        screen.blits(self.get_blit_sequence(is_selected), doreturn=False)
+
+    def get_blit_sequence(self, is_selected: bool = False):
+        """
+        Returns the pre-rendered surfaces of the button for its current state together with their positions.
+
+        :param: is_selected: A boolean indicating whether the button is currently selected.
+        :return: List of (surface, position) tuples in drawing order, as accepted by Surface.blits.
+        """
+        # Der Hintergrund und das Label werden nur bei einem maximierten Button mit Text gezeichnet
+        if self.text == '' or not self.maximized:
+            return [(self.icon, self.icon_position)]
+
+        label_surface = self.highlighted_label_surface if is_selected else self.label_surface
+        return [(self.button_background_surface, (self.x, self.y)),
+                (self.icon, self.icon_position),  # Das Icon wird links auf dem Button platziert
+                (label_surface, self.label_position)]
 
     def click(self, event):
         """
@@ -0,0 +1,102 @@
+import os
+import queue
+import threading
+
+import pygame
+
+from View.UI.SurfaceLRUCache import SurfaceLRUCache
+
+
+class ImageCache:
+    """
+    The ImageCache keeps decoded images, already scaled to fit a given area, in a least recently used cache.
+    Entries are keyed by (image path, area size, modification time), so a changed image file is loaded again and
+    the same image can be cached for several area sizes. The cache is bounded by the memory of the cached surfaces.
+
+    Images that will probably be shown soon, e.g. those of the neighbours of the selected node, can be prefetched
+    on a background thread.
+    """
+    # Upper limit of the memory used by the cached surfaces in bytes
+    MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, max_cache_bytes=MAX_CACHE_BYTES):
+        """
+        Initializes an empty ImageCache. The prefetch thread is only started on first use.
+
+        :param: max_cache_bytes: Upper limit of the memory used by the cached surfaces in bytes.
+        """
+        self.__entries = SurfaceLRUCache(max_cache_bytes)
+        self.__lock = threading.Lock()
+        self.__prefetch_queue = None
+
+    def get_scaled_image(self, image_path, area_width, area_height):
+        """
+        Returns the image at the given path, scaled to fit into the area while keeping its aspect ratio.
+
+        :param: image_path: The path of the image file.
+        :param: area_width: The width of the area the image has to fit into.
+        :param: area_height: The height of the area the image has to fit into.
+        :return: The scaled image as a pygame Surface.
+        """
+        key = self.__get_key(image_path, area_width, area_height)
+        with self.__lock:
+            scaled_image = self.__entries.get(key)
+            if scaled_image is not None:
+                return scaled_image
+
+        scaled_image = self.__load_scaled_image(image_path, area_width, area_height)
+        self.__store(key, scaled_image)
+        return scaled_image
+
+    def prefetch(self, image_paths, area_width, area_height):
+        """
+        Loads the given images into the cache on a background thread. Images that are already cached or cannot
+        be loaded are skipped.
+
+        :param: image_paths: The paths of the image files.
+        :param: area_width: The width of the area the images have to fit into.
+        :param: area_height: The height of the area the images have to fit into.
+        """
+        if self.__prefetch_queue is None:
+            self.__prefetch_queue = queue.Queue()
+            threading.Thread(target=self.__prefetch_images, name="ImagePrefetch", daemon=True).start()
+        for image_path in image_paths:
+            self.__prefetch_queue.put((image_path, area_width, area_height))
+
+    def __prefetch_images(self):
+        """
+        The loop of the prefetch thread.
+        """
+        while True:
+            image_path, area_width, area_height = self.__prefetch_queue.get()
+            try:
+                key = self.__get_key(image_path, area_width, area_height)
+                with self.__lock:
+                    if key in self.__entries:
+                        continue
+                self.__store(key, self.__load_scaled_image(image_path, area_width, area_height))
+            except (OSError, pygame.error):
+                # A missing or broken image is reported when it is actually displayed
+                continue
+
+    @staticmethod
+    def __get_key(image_path, area_width, area_height):
+        return image_path, int(area_width), int(area_height), os.path.getmtime(image_path)
+
+    @staticmethod
+    def __load_scaled_image(image_path, area_width, area_height):
+        """
+        Loads the image and scales it with the smaller of both scaling factors, so it fits into the area.
+        """
+        image = pygame.image.load(image_path)
+        image_width, image_height = image.get_size()
+        scale_factor = min(area_width / image_width, area_height / image_height)
+        return pygame.transform.scale(image, (int(image_width * scale_factor), int(image_height * scale_factor)))
+
+    def __store(self, key, scaled_image):
+        """
+        Adds an image to the cache and removes the least recently used images until the cache fits into its
+        memory limit again.
+        """
+        with self.__lock:
+            self.__entries.put(key, scaled_image)
@@ -0,0 +1,39 @@
+from bisect import bisect_left
+
+
+class MarkdownLayout:
+    """
+    The MarkdownLayout is the result of breaking a Markdown-formatted text into lines. It holds every word of the
+    text together with the font it is rendered with and its position, so the height of the text and the rendering
+    are derived from the same layout without parsing and measuring the text again.
+
+    Attributes:
+        runs (list): Tuples (font, word, x, y, width, height), ordered by their position in the text.
+        height (int): The total height required to render the text.
+    """
+
+    def __init__(self, runs, height):
+        """
+        Initializes a MarkdownLayout.
+
+        :param: runs: Tuples (font, word, x, y, width, height), ordered by their position in the text.
+        :param: height: The total height required to render the text.
+        """
+        self.runs = runs
+        self.height = height
+        # The y-coordinates of the runs never decrease, so the runs of a range of lines are found by a binary search
+        self.__run_tops = [run[3] for run in runs]
+        self.__max_run_height = max((run[5] for run in runs), default=0)
+
+    def get_runs_in_range(self, top, bottom):
+        """
+        Returns the runs that are at least partly between the two y-coordinates.
+
+        :param: top: The smallest y-coordinate of the range.
+        :param: bottom: The largest y-coordinate of the range (exclusive).
+        :return: List of the runs.
+        """
+        # A run starting above top can still reach into the range, but not further than the highest run
+        first = bisect_left(self.__run_tops, top - self.__max_run_height)
+        last = bisect_left(self.__run_tops, bottom)
+        return [run for run in self.runs[first:last] if run[3] + run[5] > top]
@@ -1,37 +1,65 @@
 import re
-
-import pygame
+from collections import OrderedDict
 
 from View.UI.FontManager.FontManager import FontManager
 from View.UI.FontManager.IFontManger import IFontManager
+from View.UI.NodeDetailsWindow.MarkdownLayout import MarkdownLayout
+from View.UI.TextSurfaceCache import TextSurfaceCache
 
 
 class MarkdownTextRenderer:
     """
     A class for rendering Markdown-formatted text using pygame.
 
+    The text is parsed and broken into lines only once per text and width. The resulting MarkdownLayout is cached,
+    so calculating the height of a text and rendering it afterwards does not repeat the work. The rendered words
+    are taken from a TextSurfaceCache.
+
     Attributes:
         font_manager (IFontManager): An instance of the FontManager to manage fonts.
         regular_font_size (int): The font size for regular text.
         BLACK (tuple): RGB color tuple representing black.
+        MAX_CACHED_LAYOUTS (int): Amount of layouts kept in the cache.
     """
-    pygame.init()
     font_manager: IFontManager
     font_manager = FontManager()
     regular_font_size = 18
     BLACK = (0, 0, 0)
+    MAX_CACHED_LAYOUTS = 32
+
+    MARKDOWN_PATTERN = re.compile(r"(?P<text>[^\*#]+)|(?P<bold_italic>\*\*\*.+?\*\*\*)|(?P<bold>\*\*.+?\*\*)"
+                                  r"|(?P<italic>\*.+?\*)|(?P<large_heading># [^\n]+)|(?P<medium_heading>## [^\n]+)"
+                                  r"|(?P<small_heading>### [^\n]+)")
 
-    def __init__(self):
+    def __init__(self, text_surface_cache: TextSurfaceCache = None):
         """
-        Initializes a MarkdownTextRenderer object, setting up fonts.
+        Initializes a MarkdownTextRenderer object, taking its fonts from the pool of the FontManager.
+
+        :param: text_surface_cache: The cache of rendered words. Defaults to the cache shared by all text renderers.
         """
-        self.normal_font = pygame.font.Font(self.font_manager.get_font_path_font_path_charissil_regular(), self.regular_font_size)
-        self.bold_font = pygame.font.Font(self.font_manager.get_font_path_charissil_bold(), self.regular_font_size)
-        self.italic_font = pygame.font.Font(self.font_manager.get_font_path_font_charissil_italic(), self.regular_font_size)
-        self.bold_italic_font = pygame.font.Font(self.font_manager.get_font_path_charissil_bolditalic(), self.regular_font_size)
-        self.large_heading_font = pygame.font.Font(self.font_manager.get_font_path_charissil_bold(), 40)
-        self.medium_heading_font = pygame.font.Font(self.font_manager.get_font_path_charissil_bold(), 30)
-        self.small_heading_font = pygame.font.Font(self.font_manager.get_font_path_charissil_bold(), 22)
+        self.text_surface_cache = (text_surface_cache if text_surface_cache is not None
+                                   else TextSurfaceCache.get_shared_cache())
+        face = FontManager.FACE_CHARIS_SIL
+        self.normal_font = self.font_manager.get_font(face, self.regular_font_size)
+        self.bold_font = self.font_manager.get_font(face, self.regular_font_size, bold=True)
+        self.italic_font = self.font_manager.get_font(face, self.regular_font_size, italic=True)
+        self.bold_italic_font = self.font_manager.get_font(face, self.regular_font_size, bold=True, italic=True)
+        self.large_heading_font = self.font_manager.get_font(face, 40, bold=True)
+        self.medium_heading_font = self.font_manager.get_font(face, 30, bold=True)
+        self.small_heading_font = self.font_manager.get_font(face, 22, bold=True)
+
+        # Font and length of the markup that is stripped from the content for each group of the pattern
+        self.__group_styles = {
+            "text": (self.normal_font, 0, 0),
+            "bold_italic": (self.bold_italic_font, 3, 3),
+            "bold": (self.bold_font, 2, 2),
+            "italic": (self.italic_font, 1, 1),
+            "large_heading": (self.large_heading_font, 2, 0),
+            "medium_heading": (self.medium_heading_font, 3, 0),
+            "small_heading": (self.small_heading_font, 4, 0),
+        }
+        # The layouts depend on the font sizes of this renderer, so the cache belongs to the instance
+        self.__layout_cache = OrderedDict()
 
     def render_markdown_text(self, surface, left_padding, right_padding, text, max_width):
         """
@@ -43,59 +71,23 @@ class MarkdownTextRenderer:
             right_padding: Padding from the right.
             text (str): The Markdown-formatted text to render.
             max_width (int): The maximum width for word wrapping.
-
-        Returns:
-            tuple: A tuple containing the total width and height of the rendered text.
-
-
         """
-        font = self.normal_font
-        total_width = left_padding
-        last_text_height = 0
-        total_height = 0
-        max_width = max_width - right_padding
-
-        pattern = r"(?P<text>[^\*#]+)|(?P<bold_italic>\*\*\*.+?\*\*\*)|(?P<bold>\*\*.+?\*\*)|(?P<italic>\*.+?\*)|(?P<large_heading># [^\n]+)|(?P<medium_heading>## [^\n]+)|(?P<small_heading>### [^\n]+)"
-
-        for line in text.split("\n"):
-            for segment in re.finditer(pattern, line):
-                content = None
-
-                if segment.group("text"):
-                    content = segment.group("text")
-                    font = self.normal_font
-                elif segment.group("bold_italic"):
-                    content = segment.group("bold_italic")[3:-3]
-                    font = self.bold_italic_font
-                elif segment.group("bold"):
-                    content = segment.group("bold")[2:-2]
-                    font = self.bold_font
-                elif segment.group("italic"):
-                    content = segment.group("italic")[1:-1]
-                    font = self.italic_font
-                elif segment.group("large_heading"):
-                    font = self.large_heading_font
-                    content = segment.group("large_heading")[2:]
-                elif segment.group("medium_heading"):
-                    font = self.medium_heading_font
-                    content = segment.group("medium_heading")[3:]
-                elif segment.group("small_heading"):
-                    font = self.small_heading_font
-                    content = segment.group("small_heading")[4:]
+        layout = self.layout_markdown_text(text, left_padding, right_padding, max_width)
+        self.render_markdown_layout(surface, layout, 0)
 
-                if content:
-                    words = content.split()
-                    for word in words:
-                        rendered_word = font.render(word, True, self.BLACK)
-                        if total_width + rendered_word.get_width() > max_width:
-                            total_height += last_text_height
-                            total_width = left_padding
-                        surface.blit(rendered_word, (total_width, total_height))
-                        total_width += rendered_word.get_width() + font.size(' ')[0]
-                        last_text_height = rendered_word.get_height()
+    def render_markdown_layout(self, surface, layout, top):
+        """
+        Renders the part of a layout that starts at the given y-coordinate and is as high as the surface. Only the
+        words inside this part are rendered, so a long text can be drawn piece by piece.
 
-            total_height += last_text_height
-            total_width = left_padding
+        Args:
+            surface (pygame.Surface): The surface to render the text on.
+            layout (MarkdownLayout): The layout returned by layout_markdown_text.
+            top (int): The y-coordinate of the layout drawn at the top edge of the surface.
+        """
+        runs = layout.get_runs_in_range(top, top + surface.get_height())
+        surface.blits([(self.text_surface_cache.render(font, word, True, self.BLACK), (x, y - top))
+                       for font, word, x, y, _, _ in runs], doreturn=False)
 
     def calculate_text_height(self, text, left_padding, right_padding, max_width):
         """
@@ -104,57 +96,73 @@ class MarkdownTextRenderer:
         Args:
             text (str): The Markdown-formatted text to calculate height for.
             left_padding (int): The starting horizontal position.
+            right_padding: Padding from the right.
             max_width (int): The maximum width for word wrapping.
 
         Returns:
             int: The total height required to render the text.
+        """
+        return self.layout_markdown_text(text, left_padding, right_padding, max_width).height
+
+    def layout_markdown_text(self, text, left_padding, right_padding, max_width):
+        """
+        Returns the layout of Markdown-formatted text, taken from the cache if the text has already been laid out
+        with the same width.
 
+        Args:
+            text (str): The Markdown-formatted text.
+            left_padding (int): The starting horizontal position.
+            right_padding: Padding from the right.
+            max_width (int): The maximum width for word wrapping.
+
+        Returns:
+            MarkdownLayout: The words of the text with their fonts and positions.
+        """
+        key = (text, left_padding, max_width - right_padding)
+        layout = self.__layout_cache.get(key)
+        if layout is not None:
+            self.__layout_cache.move_to_end(key)
+            return layout
+
+        layout = self.__create_layout(text, left_padding, max_width - right_padding)
+        self.__layout_cache[key] = layout
+        if len(self.__layout_cache) > self.MAX_CACHED_LAYOUTS:
+            self.__layout_cache.popitem(last=False)
+        return layout
+
+    def __create_layout(self, text, left_padding, max_width):
+        """
+        Parses the text and breaks it into lines. A word that does not fit into the current line starts a new line
+        below the previous word.
         """
         font = self.normal_font
+        runs = []
         total_width = left_padding
         total_height = 0
         last_text_height = 0
-        max_width = max_width - right_padding
-
-        pattern = r"(?P<text>[^\*#]+)|(?P<bold_italic>\*\*\*.+?\*\*\*)|(?P<bold>\*\*.+?\*\*)|(?P<italic>\*.+?\*)|(?P<large_heading># [^\n]+)|(?P<medium_heading>## [^\n]+)|(?P<small_heading>### [^\n]+)"
+        # font.size(' ') is measured only once per font
+        space_widths = {}
 
         for line in text.split("\n"):
-            for segment in re.finditer(pattern, line):
-                content = None
-
-                if segment.group("text"):
-                    content = segment.group("text")
-                    font = self.normal_font
-                elif segment.group("bold_italic"):
-                    content = segment.group("bold_italic")[3:-3]
-                    font = self.bold_italic_font
-                elif segment.group("bold"):
-                    content = segment.group("bold")[2:-2]
-                    font = self.bold_font
-                elif segment.group("italic"):
-                    content = segment.group("italic")[1:-1]
-                    font = self.italic_font
-                elif segment.group("large_heading"):
-                    font = self.large_heading_font
-                    content = segment.group("large_heading")[2:]
-                elif segment.group("medium_heading"):
-                    font = self.medium_heading_font
-                    content = segment.group("medium_heading")[3:]
-                elif segment.group("small_heading"):
-                    font = self.small_heading_font
-                    content = segment.group("small_heading")[4:]
+            for segment in self.MARKDOWN_PATTERN.finditer(line):
+                group = segment.lastgroup
+                font, prefix_length, suffix_length = self.__group_styles[group]
+                content = segment.group(group)[prefix_length:len(segment.group(group)) - suffix_length]
 
                 if content:
-                    words = content.split()
-                    for word in words:
+                    space_width = space_widths.get(font)
+                    if space_width is None:
+                        space_width = space_widths[font] = font.size(' ')[0]
+                    for word in content.split():
                         word_width, word_height = font.size(word)
                         if total_width + word_width > max_width:
                             total_height += last_text_height
                             total_width = left_padding
-                        total_width += word_width + font.size(' ')[0]
+                        runs.append((font, word, total_width, total_height, word_width, word_height))
+                        total_width += word_width + space_width
                         last_text_height = word_height
 
             total_height += last_text_height
             total_width = left_padding
 
-        return total_height
+        return MarkdownLayout(runs, total_height)
@@ -5,9 +5,12 @@ import pygame.freetype
 
 from GraphModel import SelectedNodeContainer
 from View.UI.NodeDetailsWindow.INodeDetailsWindow import INodeDetailsWindow
+from View.UI.NodeDetailsWindow.ImageCache import ImageCache
 from View.UI.NodeDetailsWindow.MarkdownTextRenderer import MarkdownTextRenderer
 from View.UI.NodeDetailsWindow.TextAreaScrollManager import TextAreaScrollManager
 from View.UI.NodeDetailsWindow.TextWrapper import TextWrapper
+from View.UI.NodeDetailsWindow.VirtualizedTextArea import VirtualizedTextArea
+from View.RedrawTracker import RedrawTracker
 from View.UI.UIThemes import UITheme
 
 
@@ -36,8 +39,9 @@ class NodeDetailsWindow(INodeDetailsWindow):
     NODE_DETAILS_Y_SPACING = 10  # Spacing for all Content Areas
     content_max_width = 0  # With of any Content
 
-    # Text Area
-    text_area_render_surface = None
+    # Composed image and titel of the selected node, the text is drawn by the text_area
+    header_render_surface = None
+    text_area = None
 
     # Window Dimensions
     window_width = 0
@@ -56,15 +60,19 @@ class NodeDetailsWindow(INodeDetailsWindow):
     # Scrolling
     text_area_scroll_manager = TextAreaScrollManager()
 
-    # Text Renderer
-    markdown_text_renderer = MarkdownTextRenderer()
+    # Text Renderer, created with the window so importing this module does not load any fonts
+    markdown_text_renderer = None
+
+    # Decoded and scaled images
+    image_cache = ImageCache()
 
     # Path to resources
     resources_path = None
     image_path = None
 
     def __init__(self, window_width, window_height, screen, ui_theme: UITheme,
-                 selected_node_container: SelectedNodeContainer, resources_path):
+                 selected_node_container: SelectedNodeContainer, resources_path,
+                 redraw_tracker: RedrawTracker = None):
         """
         Initializes the NodeDetailsWindow with the necessary UI components, dimensions, and resources.
 
@@ -74,6 +82,7 @@ class NodeDetailsWindow(INodeDetailsWindow):
         :param: ui_theme: The UI theme for styling the details window.
         :param: selected_node_container: A container holding the currently selected node.
         :param: resources_path: The path to the resources directory (for loading images, etc.).
+        :param: redraw_tracker: The RedrawTracker that is informed when the window needs to be drawn again.
         """
         self.resources_path = resources_path
         self.image_path = os.path.join(resources_path, 'Images')
@@ -99,39 +108,36 @@ class NodeDetailsWindow(INodeDetailsWindow):
 
         self.content_max_width = self.node_details_background_width - self.NODE_DETAILS_X_PADDING * 2
 
+        self.markdown_text_renderer = MarkdownTextRenderer()
+        self.text_area = VirtualizedTextArea(self.markdown_text_renderer, self.content_max_width,
+                                             self.node_details_background_height,
+                                             ui_theme.TEXT_WINDOW_BACKGROUND_COLOR)
+
+        self.redraw_tracker = redraw_tracker if redraw_tracker is not None else RedrawTracker()
+        self.window_region = pygame.Rect(self.node_details_window_x_pos, 0, self.node_details_background_width,
+                                         self.node_details_background_height)
+
     def show_node_details(self):
         """
         Displays the detailed information about the selected node, including scrolling functionality.
         """
         self.__check_if_re_rendering_is_required()
 
+        image_area_max_height = (self.node_details_background_height * 0.618) * 0.618
+        if self.currently_rendered_node is not self.selected_node_container.selected_node:
+            self.__prefetch_neighbour_images(self.content_max_width, image_area_max_height)
+
         self.currently_rendered_node = self.selected_node_container.selected_node
         # Display Background
         self.__display_background_area(self.node_details_window_x_pos)
 
-        # Create Image Area
-        image_area_height = self.__display_image_area(self.node_details_window_x_pos, 0, self.content_max_width,
-                                                      (self.node_details_background_height * 0.618) * 0.618,
-                                                      self.NODE_DETAILS_X_PADDING, self.NODE_DETAILS_Y_PADDING,
-                                                      self.image_path)
-
-        image_area_height_with_spacing = image_area_height + self.NODE_DETAILS_Y_SPACING
-        # Create Titel Area
-        titel_area_height = self.__display_titel_area(self.node_details_window_x_pos,
-                                                      image_area_height_with_spacing,
-                                                      self.content_max_width,
-                                                      self.NODE_DETAILS_X_PADDING, self.NODE_DETAILS_Y_PADDING)
-
-        image_and_titel_area_height_with_spacing = image_area_height_with_spacing + titel_area_height + self.NODE_DETAILS_Y_SPACING
-        # Display Text Area
-        text_area_height = self.__display_text_area_markdown(self.node_details_window_x_pos,
-                                                             image_and_titel_area_height_with_spacing,
-                                                             self.content_max_width,
-                                                             self.node_details_background_height * 0.382,
-                                                             self.NODE_DETAILS_X_PADDING, self.NODE_DETAILS_Y_PADDING)
+        # Image, Titel und Text werden nur bei einem neu selektierten Node gerendert und danach nur verschoben
+        if self.header_render_surface is None or self.re_rendering_required:
+            self.__compose_panel(image_area_max_height)
+        self.__display_panel(self.node_details_window_x_pos, self.NODE_DETAILS_X_PADDING, self.NODE_DETAILS_Y_PADDING)
 
         # Calculate if a scrollbar is necessary
-        content_height = image_and_titel_area_height_with_spacing + text_area_height
+        content_height = self.header_render_surface.get_height() + self.text_area.get_height()
         if content_height >= self.node_details_background_height:
             self.text_area_scroll_manager.calculate_scrollbar_height(self.node_details_background_height,
                                                                      self.max_content_height)
@@ -158,28 +164,52 @@ class NodeDetailsWindow(INodeDetailsWindow):
     def __display_background_area(self, x_position):
         self.screen.blit(self.node_details_background_surface, (x_position, 0))
 
-    def __display_image_area(self, x_pos, y_pos, image_area_width, image_area_height, x_padding, y_padding, image_path):
-
-        image_area_x_pos = x_pos + x_padding
-        y_pos = y_pos + y_padding
+    def __compose_panel(self, image_area_max_height):
+        """
+        Renders image and titel of the selected node once and composes them into the header surface, which is
+        afterwards only blitted with the current scroll position. The text is only laid out here and rendered by
+        the text area piece by piece while scrolling.
+        """
+        self.re_rendering_required = False
 
-        image_file_name = self.selected_node_container.selected_node.image_name
-        full_path = os.path.join(image_path, image_file_name)
-        image = pygame.image.load(full_path)
+        image_area_surface = self.__render_image_area(self.content_max_width, image_area_max_height, self.image_path)
+        image_area_height_with_spacing = image_area_surface.get_height() + self.NODE_DETAILS_Y_SPACING
 
-        # Dimensionen des geladenen Bildes ermitteln
-        image_width, image_height = image.get_size()
+        titel_area_surface = self.__render_titel_area(self.content_max_width)
+        image_and_titel_area_height_with_spacing = (image_area_height_with_spacing + titel_area_surface.get_height()
+                                                    + self.NODE_DETAILS_Y_SPACING)
 
-        # Skalierungsfaktoren für Breite und Höhe berechnen
-        scale_x = image_area_width / image_width
-        scale_y = image_area_height / image_height
+        self.__layout_text_area_markdown(self.node_details_window_x_pos, self.content_max_width,
+                                         self.node_details_background_height * 0.382,
+                                         self.NODE_DETAILS_X_PADDING, self.NODE_DETAILS_Y_PADDING)
 
-        # Den kleineren Skalierungsfaktor auswählen, um das Seitenverhältnis beizubehalten und sicherzustellen, dass das Bild in das Surface passt
-        scale_factor = min(scale_x, scale_y)
+        # Die Zwischenräume bleiben transparent, damit dort der Hintergrund des Fensters sichtbar ist
+        self.header_render_surface = pygame.Surface(
+            (self.content_max_width, image_and_titel_area_height_with_spacing), pygame.SRCALPHA)
+        self.header_render_surface.fill(self.ui_theme.FULL_ALPHA)
+        self.header_render_surface.blit(image_area_surface, (0, 0))
+        self.header_render_surface.blit(titel_area_surface, (0, image_area_height_with_spacing))
 
-        # Das Bild mit dem gewählten Skalierungsfaktor skalieren
-        scaled_image = pygame.transform.scale(image,
-                                              (int(image_width * scale_factor), int(image_height * scale_factor)))
+    def __display_panel(self, x_pos, x_padding, y_padding):
+        """
+        Blits the visible part of the header and the text with the current scroll position.
+        """
+        scroll_position = self.text_area_scroll_manager.scroll_position
+        # Only the rows of the header that are inside the window are blitted
+        first_visible_row = max(0, int(scroll_position - y_padding))
+        visible_area = pygame.Rect(0, first_visible_row, self.header_render_surface.get_width(),
+                                   self.node_details_background_height)
+        self.screen.blit(self.header_render_surface,
+                         (x_pos + x_padding, y_padding - scroll_position + first_visible_row), visible_area)
+
+        text_y = int(y_padding - scroll_position) + self.header_render_surface.get_height()
+        self.text_area.draw(self.screen, x_pos + x_padding, text_y, 0, self.node_details_background_height)
+
+    def __render_image_area(self, image_area_width, image_area_height, image_path):
+        image_file_name = self.selected_node_container.selected_node.image_name
+        full_path = os.path.join(image_path, image_file_name)
+        # Das Bild wird nur beim ersten Mal geladen und skaliert, danach aus dem Cache gelesen
+        scaled_image = self.image_cache.get_scaled_image(full_path, image_area_width, image_area_height)
 
         image_area_render_surface = pygame.Surface((image_area_width, image_area_height))
         image_area_render_surface.fill(self.ui_theme.TEXT_WINDOW_BACKGROUND_COLOR)
@@ -187,14 +217,18 @@ class NodeDetailsWindow(INodeDetailsWindow):
         blit_x = (image_area_width - scaled_image.get_width()) // 2
         blit_y = (image_area_height - scaled_image.get_height()) // 2
         image_area_render_surface.blit(scaled_image, (blit_x, blit_y))
+        return image_area_render_surface
 
-        self.screen.blit(image_area_render_surface,
-                         (image_area_x_pos, y_pos - self.text_area_scroll_manager.scroll_position))
-        return image_area_render_surface.get_height()
+    def __prefetch_neighbour_images(self, image_area_width, image_area_height):
+        """
+        Loads the images of the nodes connected to the selected node in the background, so they are already cached
+        when the user selects one of them.
+        """
+        image_paths = {os.path.join(self.image_path, connected_node.image_name)
+                       for connected_node in self.selected_node_container.selected_node.get_connected_nodes().values()}
+        self.image_cache.prefetch(image_paths, image_area_width, image_area_height)
 
-    def __display_titel_area(self, x_pos, y_pos, titel_area_width, x_padding, y_padding):
-        titel_area_x_pos = x_pos + x_padding
-        titel_area_y_pos = y_pos + y_padding
+    def __render_titel_area(self, titel_area_width):
         left_padding = self.window_width * 0.015
         right_padding = self.window_width * 0.015
 
@@ -210,50 +244,28 @@ class NodeDetailsWindow(INodeDetailsWindow):
         titel_area_render_surface.fill(self.ui_theme.TEXT_WINDOW_BACKGROUND_COLOR)
         self.markdown_text_renderer.render_markdown_text(titel_area_render_surface, left_padding, right_padding,
                                                          titel_with_heading, titel_area_width)
+        return titel_area_render_surface
 
-        self.screen.blit(titel_area_render_surface,
-                         (titel_area_x_pos, titel_area_y_pos - self.text_area_scroll_manager.scroll_position))
-        return titel_area_render_surface.get_height()
-
-    def __display_text_area_markdown(self, x_pos, y_pos, text_area_width, image_and_titel_area_height,
-                                     x_padding, y_padding):
+    def __layout_text_area_markdown(self, x_pos, text_area_width, image_and_titel_area_height, x_padding, y_padding):
         """
-        Private method to display the text content within the window.
+        Private method to lay out the text content of the selected node and pass it to the text area.
         """
-        # X Versatz definieren
-        text_area_x_pos = x_pos + x_padding
-        text_area_y_pos = y_pos + y_padding
         left_padding = self.window_width * 0.015
         right_padding = self.window_width * 0.015
 
-        # Zeige den Text des ausgewählten Knotens im Textfenster an
-        if self.selected_node_container.selected_node is not None and self.re_rendering_required:
-            self.re_rendering_required = False
-
-            # Text abrufen
-            text = self.selected_node_container.selected_node.description
-
-            # Berechnen der maximalen Höhe des Textfensters basierend auf der Anzahl der Zeilen und der Zeilenhöhe
-            max_text_height = self.markdown_text_renderer.calculate_text_height(text, left_padding, right_padding,
-                                                                                text_area_width)
-            self.max_content_height = image_and_titel_area_height + max_text_height
-            # Erstellen eines Rechtecks für das Textfenster
-            self.collision_text_window_rect = pygame.Rect(x_padding + x_pos,
-                                                          y_padding - self.text_area_scroll_manager.scroll_position,
-                                                          text_area_width, self.max_content_height)
-
-            # Erstellen eines separaten Surface für das Textfenster
-            self.text_area_render_surface = pygame.Surface((text_area_width, max_text_height))
-
-            # Rendern des Texts auf dem separaten Surface
-            self.text_area_render_surface.fill(self.ui_theme.TEXT_WINDOW_BACKGROUND_COLOR)
-            self.markdown_text_renderer.render_markdown_text(self.text_area_render_surface, left_padding, right_padding,
-                                                             text, text_area_width)
+        # Text abrufen
+        text = self.selected_node_container.selected_node.description
 
-        # Zeichne das Textfenster
-        self.screen.blit(self.text_area_render_surface,
-                         (text_area_x_pos, text_area_y_pos - self.text_area_scroll_manager.scroll_position))
-        return self.text_area_render_surface.get_height()
+        # Der Text wird einmal umgebrochen, die Höhe des Textfensters ergibt sich aus dem Layout
+        text_layout = self.markdown_text_renderer.layout_markdown_text(text, left_padding, right_padding,
+                                                                       text_area_width)
+        self.text_area.set_layout(text_layout)
+        max_text_height = text_layout.height
+        self.max_content_height = image_and_titel_area_height + max_text_height
+        # Erstellen eines Rechtecks für das Textfenster
+        self.collision_text_window_rect = pygame.Rect(x_padding + x_pos,
+                                                      y_padding - self.text_area_scroll_manager.scroll_position,
+                                                      text_area_width, self.max_content_height)
 
     def check_text_area_collision(self, event):
         """
@@ -289,6 +301,7 @@ class NodeDetailsWindow(INodeDetailsWindow):
         """
         self.text_area_scroll_manager.apply_scrollbar_scroll(self.node_details_background_height,
                                                              self.max_content_height)
+        self.redraw_tracker.mark_dirty(self.window_region)
 
     def is_drag_scrolling(self):
         """
@@ -335,6 +348,7 @@ class NodeDetailsWindow(INodeDetailsWindow):
         This method scrolls the text area content upwards.
         """
         self.text_area_scroll_manager.scroll_up()
+        self.redraw_tracker.mark_dirty(self.window_region)
 
     def scroll_down(self):
         """
@@ -343,3 +357,4 @@ class NodeDetailsWindow(INodeDetailsWindow):
         This method scrolls the text area content downwards.
         """
         self.text_area_scroll_manager.scroll_down()
+        self.redraw_tracker.mark_dirty(self.window_region)
@@ -1,40 +1,125 @@
+import pygame.freetype
+
+
 class TextWrapper:
     """
     The TextWrapper class provides a utility for breaking text into lines with automatic word wrapping.
     It takes a text string, a font, and a maximum width as input and returns a list of wrapped lines.
 
     Each element in the 'wrapped_lines' list represents a line of text that fits within the specified width.
+
+    Every word is measured only once and the widths of the lines are accumulated from the widths of their words.
+    The measured words of the last text are kept, so wrapping the same text again with another maximum width, e.g.
+    while the window is resized, does not measure anything again. A word that is wider than a whole line is broken
+    at the longest prefix that still fits, which is found by a binary search.
     """
 
+    def __init__(self):
+        """
+        Initializes a TextWrapper without a measured text.
+        """
+        self.__measured_key = None
+        self.__measured_paragraphs = None
+        self.__space_width = 0
+
     def wrap_text(self, text, font, max_width):
         """
         Wrap the given 'text' into lines based on the provided 'font' and 'max_width'.
 
         Args:
             text (str): The input text to be wrapped.
-            font (pygame.font.Font): The font used for rendering the text.
+            font (pygame.font.Font or pygame.freetype.Font): The font used for rendering the text.
             max_width (int): The maximum width for each line.
 
         Returns:
             list of str: A list of wrapped lines.
         """
-        paragraphs = text.split('\n')
+        paragraphs, space_width = self.__get_measured_paragraphs(text, font)
         lines = []
-        for paragraph in paragraphs:
-            words = paragraph.split()
-            current_line = ""
-            for word in words:
-                test_line = current_line + word + " "
-                test_rect = font.get_rect(test_line)
-                if test_rect.width <= max_width:
-                    current_line = test_line
-                else:
-                    lines.append(current_line)
-                    current_line = word + " "
-            lines.append(current_line)
+        for words, widths, paragraph_width in paragraphs:
+            # A paragraph that fits completely does not need to be broken
+            if paragraph_width <= max_width:
+                lines.append("".join(word + " " for word in words))
+            else:
+                self.__wrap_paragraph(words, widths, font, space_width, max_width, lines)
             # Add an empty line after each paragraph
             lines.append("")
         # Remove the last empty line added after the last paragraph
         if lines[-1] == "":
             lines.pop()
         return lines
+
+    def __wrap_paragraph(self, words, widths, font, space_width, max_width, lines):
+        """
+        Breaks the words of a paragraph into lines and appends them to 'lines'. Every line ends with a space, which
+        is included when testing if a word fits.
+        """
+        current_words = []
+        current_width = 0
+        for word, word_width in zip(words, widths):
+            if current_width + word_width + space_width <= max_width:
+                current_words.append(word)
+                current_width += word_width + space_width
+                continue
+
+            if current_words:
+                lines.append("".join(current_word + " " for current_word in current_words))
+            current_words = []
+            current_width = 0
+            if word_width + space_width > max_width:
+                # Only the last piece of a word that is too long for a line starts the next line
+                pieces = self.__break_word(word, font, max_width)
+                lines.extend(pieces[:-1])
+                word = pieces[-1]
+                word_width = self.__measure(font, word)
+            current_words.append(word)
+            current_width = word_width + space_width
+        lines.append("".join(current_word + " " for current_word in current_words))
+
+    def __break_word(self, word, font, max_width):
+        """
+        Breaks a word into pieces that fit into a line. Each piece is the longest prefix of the rest of the word that
+        fits, but at least one character.
+        """
+        pieces = []
+        while word:
+            low, high = 1, len(word)
+            while low < high:
+                middle = (low + high + 1) // 2
+                if self.__measure(font, word[:middle]) <= max_width:
+                    low = middle
+                else:
+                    high = middle - 1
+            pieces.append(word[:low])
+            word = word[low:]
+        return pieces
+
+    def __get_measured_paragraphs(self, text, font):
+        """
+        Returns the paragraphs of the text as tuples (words, widths of the words, width of the paragraph including
+        the trailing spaces) and the width of a space. The result for the last text and font is reused.
+        """
+        key = (text, id(font), self.__get_font_size(font))
+        if key != self.__measured_key:
+            self.__space_width = self.__measure(font, " ")
+            self.__measured_paragraphs = []
+            for paragraph in text.split('\n'):
+                words = paragraph.split()
+                widths = [self.__measure(font, word) for word in words]
+                paragraph_width = sum(widths) + self.__space_width * len(words)
+                self.__measured_paragraphs.append((words, widths, paragraph_width))
+            self.__measured_key = key
+        return self.__measured_paragraphs, self.__space_width
+
+    @staticmethod
+    def __measure(font, text):
+        """
+        Returns the horizontal advance of the text, i.e. how far the next text would start.
+        """
+        if isinstance(font, pygame.freetype.Font):
+            return sum(metrics[4] for metrics in font.get_metrics(text) if metrics is not None)
+        return font.size(text)[0]
+
+    @staticmethod
+    def __get_font_size(font):
+        return font.size if isinstance(font, pygame.freetype.Font) else font.get_height()
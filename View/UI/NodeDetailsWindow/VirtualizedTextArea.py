@@ -0,0 +1,102 @@
+import math
+from collections import OrderedDict
+
+import pygame
+
+from View.UI.NodeDetailsWindow.MarkdownLayout import MarkdownLayout
+from View.UI.NodeDetailsWindow.MarkdownTextRenderer import MarkdownTextRenderer
+
+
+class VirtualizedTextArea:
+    """
+    The VirtualizedTextArea draws a laid out Markdown text of any length without rendering it into one surface of
+    the full text height. The text is divided into horizontal tiles of a fixed height, and only the tiles that
+    intersect the visible part of the window are rendered. The amount of tile surfaces is bounded by the height of
+    the visible part; when the user scrolls, the surfaces of tiles that left the visible part are reused for the
+    tiles that entered it.
+    """
+    # Height of a tile in pixels
+    TILE_HEIGHT = 256
+    # Amount of tiles kept beyond the ones needed to cover the visible part, so scrolling back and forth by a small
+    # distance does not render tiles again
+    SPARE_TILES = 2
+
+    def __init__(self, markdown_text_renderer: MarkdownTextRenderer, width, viewport_height, background_color):
+        """
+        Initializes the VirtualizedTextArea without a text.
+
+        :param: markdown_text_renderer: The renderer used to rasterize the tiles.
+        :param: width: The width of the text area.
+        :param: viewport_height: The height of the visible part of the window.
+        :param: background_color: The color the tiles are filled with before the text is rendered.
+        """
+        self.markdown_text_renderer = markdown_text_renderer
+        self.width = int(width)
+        self.background_color = background_color
+        self.max_tiles = math.ceil(viewport_height / self.TILE_HEIGHT) + 1 + self.SPARE_TILES
+        self.layout = None
+        # Rendered tiles by tile index in least recently used order
+        self.__tiles = OrderedDict()
+        self.__free_surfaces = []
+
+    def set_layout(self, layout: MarkdownLayout):
+        """
+        Sets the text to be drawn. The surfaces of the previous text are kept for reuse.
+
+        :param: layout: The layout of the text.
+        """
+        self.layout = layout
+        self.__free_surfaces.extend(self.__tiles.values())
+        self.__tiles.clear()
+
+    def get_height(self):
+        """
+        Returns the height of the text.
+        """
+        return self.layout.height if self.layout is not None else 0
+
+    def draw(self, screen, x, y, visible_top, visible_bottom):
+        """
+        Draws the part of the text that lies between two y-coordinates of the screen.
+
+        :param: screen: The surface to draw on.
+        :param: x: The x-coordinate of the left edge of the text on the screen.
+        :param: y: The y-coordinate of the top edge of the text on the screen. It is negative when the text is
+        scrolled above the screen.
+        :param: visible_top: The smallest y-coordinate of the screen that is drawn on.
+        :param: visible_bottom: The largest y-coordinate of the screen that is drawn on (exclusive).
+        """
+        text_height = self.get_height()
+        text_top = max(visible_top - y, 0)
+        text_bottom = min(visible_bottom - y, text_height)
+        if text_top >= text_bottom:
+            return
+
+        first_tile = int(text_top // self.TILE_HEIGHT)
+        last_tile = int((text_bottom - 1) // self.TILE_HEIGHT)
+        for tile_index in range(first_tile, last_tile + 1):
+            tile_top = tile_index * self.TILE_HEIGHT
+            # The last tile is cut at the end of the text, so the window background stays visible below it
+            area = pygame.Rect(0, 0, self.width, min(self.TILE_HEIGHT, text_height - tile_top))
+            screen.blit(self.__get_tile(tile_index), (x, y + tile_top), area)
+
+    def __get_tile(self, tile_index):
+        """
+        Returns the surface of a tile, rendering it into a free or the least recently used surface if necessary.
+        """
+        tile_surface = self.__tiles.get(tile_index)
+        if tile_surface is not None:
+            self.__tiles.move_to_end(tile_index)
+            return tile_surface
+
+        if self.__free_surfaces:
+            tile_surface = self.__free_surfaces.pop()
+        elif len(self.__tiles) >= self.max_tiles:
+            _, tile_surface = self.__tiles.popitem(last=False)
+        else:
+            tile_surface = pygame.Surface((self.width, self.TILE_HEIGHT))
+
+        tile_surface.fill(self.background_color)
+        self.markdown_text_renderer.render_markdown_layout(tile_surface, self.layout, tile_index * self.TILE_HEIGHT)
+        self.__tiles[tile_index] = tile_surface
+        return tile_surface
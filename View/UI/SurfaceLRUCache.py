@@ -0,0 +1,67 @@
+from collections import OrderedDict
+
+
+class SurfaceLRUCache:
+    """
+    The SurfaceLRUCache keeps pygame surfaces by key in least recently used order and is bounded by the memory of
+    the cached surfaces. When a new surface exceeds the limit, the least recently used surfaces are removed, but the
+    newest surface is always kept, even if it alone exceeds the limit.
+
+    It is the storage of the ImageCache and the TextSurfaceCache. It is not thread safe, callers sharing it between
+    threads have to lock it.
+    """
+
+    def __init__(self, max_cache_bytes):
+        """
+        Initializes an empty SurfaceLRUCache.
+
+        :param: max_cache_bytes: Upper limit of the memory used by the cached surfaces in bytes.
+        """
+        self.max_cache_bytes = max_cache_bytes
+        self.cache_bytes = 0
+        self.__entries = OrderedDict()
+
+    def get(self, key):
+        """
+        Returns the surface stored under the key and marks it as most recently used.
+
+        :param: key: The key of the surface.
+        :return: The surface, or None if it is not cached.
+        """
+        surface = self.__entries.get(key)
+        if surface is not None:
+            self.__entries.move_to_end(key)
+        return surface
+
+    def put(self, key, surface):
+        """
+        Adds a surface to the cache, unless the key is already cached, and removes the least recently used surfaces
+        until the cache fits into its memory limit again.
+
+        :param: key: The key of the surface.
+        :param: surface: The surface to be cached.
+        """
+        if key in self.__entries:
+            return
+        self.__entries[key] = surface
+        self.cache_bytes += self.__get_size_in_bytes(surface)
+        while self.cache_bytes > self.max_cache_bytes and len(self.__entries) > 1:
+            _, removed_surface = self.__entries.popitem(last=False)
+            self.cache_bytes -= self.__get_size_in_bytes(removed_surface)
+
+    def clear(self):
+        """
+        Removes all surfaces from the cache.
+        """
+        self.__entries.clear()
+        self.cache_bytes = 0
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    def __len__(self):
+        return len(self.__entries)
+
+    @staticmethod
+    def __get_size_in_bytes(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
@@ -0,0 +1,82 @@
+from View.UI.SurfaceLRUCache import SurfaceLRUCache
+
+
+class TextSurfaceCache:
+    """
+    The TextSurfaceCache keeps rendered text surfaces, usually single words, in a least recently used cache, so words
+    that occur again and again, e.g. "der", "die" and "und", are rendered only once. Entries are keyed by the font,
+    its style, the text and the colors. The cache is bounded by the memory of the cached surfaces.
+
+    The cache is meant to be shared by all text renderers of the application, see get_shared_cache.
+    """
+    # Upper limit of the memory used by the cached surfaces in bytes
+    MAX_CACHE_BYTES = 16 * 1024 * 1024
+
+    __shared_cache = None
+
+    def __init__(self, max_cache_bytes=MAX_CACHE_BYTES):
+        """
+        Initializes an empty TextSurfaceCache.
+
+        :param: max_cache_bytes: Upper limit of the memory used by the cached surfaces in bytes.
+        """
+        self.__entries = SurfaceLRUCache(max_cache_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def get_shared_cache(cls):
+        """
+        Returns the cache shared by all text renderers. It is created on first use.
+        """
+        if cls.__shared_cache is None:
+            cls.__shared_cache = cls()
+        return cls.__shared_cache
+
+    def render(self, font, text, antialias, color, background=None):
+        """
+        Returns the text rendered with the given font, like font.render, taken from the cache if it has already been
+        rendered. The returned surface is shared and must not be drawn on.
+
+        :param: font: The pygame.font.Font used for rendering.
+        :param: text: The text to be rendered.
+        :param: antialias: True to render with smooth edges.
+        :param: color: The color of the text.
+        :param: background: The background color, or None for a transparent background.
+        :return: The rendered text as a pygame Surface.
+        """
+        key = (font, font.get_bold(), font.get_italic(), font.get_underline(), text, antialias, tuple(color),
+               None if background is None else tuple(background))
+        text_surface = self.__entries.get(key)
+        if text_surface is not None:
+            self.hits += 1
+            return text_surface
+
+        self.misses += 1
+        text_surface = font.render(text, antialias, color, background)
+        self.__entries.put(key, text_surface)
+        return text_surface
+
+    def get_statistics(self):
+        """
+        Returns the statistics of the cache.
+
+        :return: Dictionary with the amount of hits, misses, the hit rate, the amount of entries and the memory of
+        the cached surfaces in bytes.
+        """
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests > 0 else 0.0,
+            "entries": len(self.__entries),
+            "bytes": self.__entries.cache_bytes,
+        }
+
+    def clear(self):
+        """
+        Removes all surfaces from the cache and resets the statistics.
+        """
+        self.__entries.clear()
+        self.hits = 0
+        self.misses = 0
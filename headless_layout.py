@@ -0,0 +1,34 @@
+import argparse
+import sys
+
+from GraphController.GraphLayoutHandler.HeadlessLayoutRunner import HeadlessLayoutRunner, LayoutResult
+
+if __name__ == '__main__':
+    # Layout eines exportierten Graphen ohne Fenster berechnen, z.B. in Batch-Jobs
+    parser = argparse.ArgumentParser(description="Berechnet das Layout eines exportierten Graphen ohne Anzeige.")
+    parser.add_argument("input", help="ZIP-Datei, die mit dem GraphExporter exportiert wurde")
+    parser.add_argument("output", help="ZIP-Datei, in die der positionierte Graph geschrieben wird")
+    parser.add_argument("--max-iterations", type=int, default=1000,
+                        help="Maximale Anzahl an Simulationsschritten")
+    parser.add_argument("--displacement-threshold", type=float, default=0.05,
+                        help="Konvergiert, sobald die Kräfte die Knoten ohne Geschwindigkeitsbegrenzung im Mittel "
+                             "weniger weit bewegen würden")
+    parser.add_argument("--kinetic-energy-threshold", type=float, default=None,
+                        help="Konvergiert, sobald die kinetische Energie aller Knoten ohne Geschwindigkeitsbegrenzung "
+                             "darunter fällt")
+    parser.add_argument("--cooling-factor", type=float, default=0.99,
+                        help="Faktor, mit dem die maximale Geschwindigkeit nach jedem Schritt multipliziert wird")
+    parser.add_argument("--parallel-workers", type=int, default=0,
+                        help="Anzahl der Prozesse für die Berechnung der Abstoßung großer Graphen")
+    arguments = parser.parse_args()
+
+    runner = HeadlessLayoutRunner(max_iterations=arguments.max_iterations,
+                                  displacement_threshold=arguments.displacement_threshold,
+                                  kinetic_energy_threshold=arguments.kinetic_energy_threshold,
+                                  cooling_factor=arguments.cooling_factor,
+                                  parallel_workers=arguments.parallel_workers)
+    result = runner.layout_zip(arguments.input, arguments.output)
+    print(result)
+    # 0: konvergiert, 2: durch Abkühlung beendet, 1: Iterationsbudget erschöpft
+    exit_codes = {LayoutResult.CONVERGED: 0, LayoutResult.COOLED: 2, LayoutResult.MAX_ITERATIONS: 1}
+    sys.exit(exit_codes[result.stop_reason])